@@ -1,21 +1,65 @@
 import os
 import shutil
 import json
-from core.data_manager import DataManager, DataType
-from core.models.multiple_linear_regression import MultipleLinearRegressionModel
+import hashlib
+import threading
+# Sin efectos secundarios al importar: los datos y el modelo se cargan en segundo plano.
+# pandas y sklearn se importan solo cuando hacen falta.
 import core.model_trainer
 import core.data_holder
+from core.config import PROCESSED_RETENTION
+from core.store import ProcessedStore
+from core.instrumentation import recorder, instrumented, stage
+from app.jobs import JobManager, JobCancelled
 
 class Api:
     def __init__(self):
         self.window = None
         self.default_data_path = os.path.join('data', 'default_datasets')
         self.raw_data_output_path = os.path.join('data', 'raw')
-        self._processed_data_cache = None
+        self.processed_data_path = os.path.join('data', 'processed')
+        self._ready = threading.Event()
+        self._loader_thread = None
+        self._loader_lock = threading.Lock()
+        # Un único trabajador: dos procesamientos nunca se ejecutan a la vez
+        self.jobs = JobManager(on_update=self._on_job_update)
 
     def set_window(self, window):
         self.window = window
 
+    def start_background_loading(self):
+        """
+        Loads the processed data, test data and model on a background thread so the
+        window can be shown first. Calling it again while it runs, or once the backend
+        is loaded (also by a processing job), does nothing.
+        """
+        with self._loader_lock:
+            if self._loader_thread is None and not self._ready.is_set():
+                self._loader_thread = threading.Thread(target=self._load_backend, name='backend-loader', daemon=True)
+                self._loader_thread.start()
+
+    def _load_backend(self):
+        try:
+            core.data_holder.load()
+            core.model_trainer.load()
+        finally:
+            self._ready.set()
+        print("API: Background loading finished.")
+        if self.window:
+            status = json.dumps(self.get_status())
+            self.window.evaluate_js(f'window.onBackendReady && window.onBackendReady({status})')
+
+    def _wait_until_ready(self):
+        # Si nadie inició la carga, se inicia en el primer uso
+        self.start_background_loading()
+        self._ready.wait()
+
+    def get_status(self):
+        return {
+            "ready": self._ready.is_set(),
+            "model_loaded": core.model_trainer.get_model() is not None
+        }
+
     def load_default_datasets(self):
         try:
             if not os.path.isdir(self.default_data_path):
@@ -25,126 +69,181 @@ class Api:
         except Exception as e:
             return []
 
+    PROCESSING_STAGES = [
+        'ingest', 'AvgGoalsCalculator', 'StreaksCalculator', 'AvgShotsCalculator',
+        'AvgCornersCalculator', 'AvgPointsCalculator', 'EfficiencyCalculator',
+        'EwmFormCalculator', 'save', 'train', 'reload'
+    ]
+
     def process_files(self, files_to_process):
+        """
+        Validates the request and queues the processing job. The work runs on the
+        JobManager worker and reports progress through window.onProcessingProgress.
+        """
         print("Received for processing:", 
               [{'name': f.get('name'), 'type': f.get('type')} for f in files_to_process])
 
         # --- 1. Determinar el modo de operación ---
         has_uploaded_files = any(f.get('type') == 'uploaded' for f in files_to_process)
         has_default_files = any(f.get('type') == 'default' for f in files_to_process)
-        
-        data_manager_type = None
 
-        # --- 2. Preparar los datos si es necesario ---
+        files_to_write = []
         if has_uploaded_files:
-            print("Processing mode: RAW (uploaded files found).")
             files_to_write = [f for f in files_to_process if f.get('type') == 'uploaded' and f.get('content') is not None]
             if not files_to_write:
                 return {"status": "error", "message": "Uploaded files were found, but they have no content to save."}
+        elif not has_default_files:
+            return {"status": "info", "message": "No files were selected for processing."}
+
+        fingerprint = tuple(sorted(
+            (f.get('name'), f.get('type'), hashlib.sha256((f.get('content') or '').encode('utf-8')).hexdigest())
+            for f in files_to_process
+        ))
+        job, accepted = self.jobs.submit('process_files', self._run_processing, (files_to_write,), fingerprint)
+        if not accepted:
+            return {"status": "duplicate", "job_id": job.id, "message": "These files are already being processed."}
+        return {"status": "queued", "job_id": job.id}
+
+    def cancel_processing(self, job_id=None):
+        return {"cancelled": self.jobs.cancel(job_id)}
+
+    def get_job_status(self, job_id):
+        return self.jobs.get(job_id) or {"error": f"Unknown job {job_id}"}
+
+    def _on_job_update(self, job):
+        if self.window:
+            self.window.evaluate_js(f'window.onProcessingProgress && window.onProcessingProgress({json.dumps(job)})')
+
+    @instrumented('Api.process_files')
+    def _run_processing(self, job, files_to_write):
+        from core.data_manager import DataManager, DataType, ProcessingCancelled
+        from core.models.registry import ModelRegistry
+
+        def report(stage):
+            fraction = self.PROCESSING_STAGES.index(stage) / len(self.PROCESSING_STAGES) if stage in self.PROCESSING_STAGES else job.progress
+            try:
+                self.jobs.report(job, stage, fraction)
+            except JobCancelled:
+                raise ProcessingCancelled(f"Job {job.id} was cancelled")
+
+        # --- 2. Preparar los datos si es necesario ---
+        written_files = []
+        if files_to_write:
+            print("Processing mode: RAW (uploaded files found).")
             try:
                 os.makedirs(self.raw_data_output_path, exist_ok=True)
             except OSError as e:
-                return {"status": "error", "message": f"Could not create destination directory: {e}"}
+                raise RuntimeError(f"Could not create destination directory: {e}")
             for detail in files_to_write:
                 dest_path = os.path.join(self.raw_data_output_path, detail['name'])
                 try:
                     with open(dest_path, 'w', encoding='utf-8') as f:
                         f.write(detail['content'])
+                    written_files.append(dest_path)
                     print(f"Content for '{detail['name']}' written to: '{dest_path}'")
                 except Exception as e:
                     print(f"Error writing content for '{detail['name']}': {e}")
-                    return {"status": "error", "message": f"Failed to write file {detail['name']}: {e}"}
+                    raise RuntimeError(f"Failed to write file {detail['name']}: {e}")
             data_manager_type = DataType.RAW
-        elif has_default_files:
+        else:
             print("Processing mode: DEFAULT (no uploaded files, default files selected).")
             data_manager_type = DataType.DEFAULT
-        
-        # --- 3. Ejecutar el DataManager si se determinó un modo ---
-        if data_manager_type:
-            try:
-                data_manager = DataManager(data_type=data_manager_type)
+
+        # --- 3. Ejecutar el DataManager ---
+        try:
+            data_manager = DataManager(data_type=data_manager_type, progress=report)
+            # Only the new matches get features when they come after the stored state
+            incremental = bool(written_files) and data_manager.process_incremental(written_files)
+            if not incremental:
                 data_manager.process_data()
                 data_manager.save_data()
 
-                # --- TRAIN AND SAVE THE MODEL ---
-                model = MultipleLinearRegressionModel()
-                model.train(data_manager.data) 
-                model.save()
-
-                # --- UPDATE ALL IN-MEMORY DATA ---
-                data_loader = DataManager()
-                core.data_holder.PROCESSED_DATA_JSON = data_loader.get_data_as_json()
-                core.data_holder.TEST_DATA_JSON = data_loader.get_data_as_json(DataType.TEST)
-                
-                # --- KEY CHANGE ---
-                # Replace the global model instance with our newly trained one.
-                core.model_trainer.model_instance = model
-                
-                self._processed_data_cache = None 
-                
-                if self.window:
-                    self.window.load_url('layout.html')
-                return
+            # --- TRAIN AND SAVE THE MODELS ---
+            report('train')
+            # Tras un procesamiento incremental, los modelos que lo admiten solo añaden los partidos nuevos
+            registry = ModelRegistry()
+            registry.train(data_manager.data, update=incremental)
+            registry.save()
 
-            except Exception as e:
-                print(f"An error occurred during data processing: {e}")
-                return {"status": "error", "message": f"Data processing failed: {e}"}
-        else:
-            return {"status": "info", "message": "No files were selected for processing."}
+            # --- UPDATE ALL IN-MEMORY DATA ---
+            report('reload')
+        except ProcessingCancelled:
+            print(f"Processing job {job.id} cancelled.")
+            raise JobCancelled(f"Job {job.id} was cancelled")
+
+        # Con el cerrojo no puede empezar una carga desde disco mientras se instalan los
+        # datos nuevos; una que ya esté en marcha termina antes para no sobrescribirlos
+        with self._loader_lock:
+            if self._loader_thread is not None:
+                self._ready.wait()
+            core.data_holder.set_processed_data(data_manager.data)
+            core.data_holder.TEST_DATA_JSON = DataManager().get_data_as_json(DataType.TEST)
+
+            # --- KEY CHANGE ---
+            # Replace the global model registry with our newly trained one.
+            core.model_trainer.registry = registry
+
+            # El backend queda cargado: el primer uso no lanzará el cargador
+            self._ready.set()
         
-    def get_data(self):
+        if self.window:
+            self.window.load_url('layout.html')
+        
+    @instrumented('Api.get_data')
+    def get_data(self, columns=None, team=None, date_from=None, date_to=None, sort_by=None, ascending=True):
         try:
-            print("API: get_data() called. Pushing pre-loaded data to dashboard.")
+            print("API: get_data() called. Pushing first page of processed data to dashboard.")
+            self._wait_until_ready()
             if self.window:
                 # KEY CHANGE: Always read the variable from the module's namespace.
-                data_json = core.data_holder.PROCESSED_DATA_JSON
-                
-                if self._processed_data_cache is None:
-                    self._processed_data_cache = json.loads(data_json)
-                
-                data = self._processed_data_cache
-                
-                if isinstance(data, list):
-                    batch_size = 100
-                    initial_batch = data[:batch_size]
-                    initial_batch_json = json.dumps(initial_batch)
-                    total_count = len(data)
-                    print(f"Sending first {len(initial_batch)} rows of {total_count} total records")
-                    self.window.evaluate_js(f'renderDashboardData({initial_batch_json}, {total_count})')
-                else:
-                    self.window.evaluate_js(f'renderDashboardData({data_json})')
+                pager = core.data_holder.PAGER
+                if pager is None:
+                    self.window.evaluate_js(f'renderDashboardError({json.dumps("No processed data available.")})')
+                    return
+
+                batch_size = 100
+                initial_batch_json, total_count = pager.page(
+                    0, batch_size, columns, team, date_from, date_to, sort_by, ascending
+                )
+                print(f"Sending first {min(batch_size, total_count)} rows of {total_count} total records")
+                self.window.evaluate_js(f'renderDashboardData({initial_batch_json}, {total_count})')
         except Exception as e:
             print(f"API Error in get_data: {e}")
             if self.window:
                 error_message = json.dumps(f"Error fetching data: {e}")
                 self.window.evaluate_js(f'renderDashboardError({error_message})')
 
-    def get_more_data(self, start_index, batch_size):
-        try:
-            print(f"API: get_more_data() called. Requesting rows {start_index} to {start_index + batch_size}")
-            
-            if self._processed_data_cache is None:
-                # KEY CHANGE: Read from the module's namespace.
-                self._processed_data_cache = json.loads(core.data_holder.PROCESSED_DATA_JSON)
-                
-            data = self._processed_data_cache
-            
-            if not isinstance(data, list):
+    def get_more_data(self, start_index, batch_size, columns=None, team=None, date_from=None,
+                      date_to=None, sort_by=None, ascending=True):
+        """
+        Returns one page of processed rows. Only the requested window and columns are
+        serialized; the optional team/date filters and sort must match the get_data call.
+        """
+        # Las filas registradas son las devueltas: la última página o una filtrada tienen menos
+        with stage('Api.get_more_data', rows=0) as record:
+            try:
+                print(f"API: get_more_data() called. Requesting rows {start_index} to {start_index + batch_size}")
+                self._wait_until_ready()
+
+                pager = core.data_holder.PAGER
+                if pager is None:
+                    return []
+
+                page_json, _ = pager.page(start_index, batch_size, columns, team, date_from, date_to, sort_by, ascending)
+                next_batch = json.loads(page_json)
+                record.rows = len(next_batch)
+
+                print(f"Returning {len(next_batch)} additional rows")
+                return next_batch
+
+            except Exception as e:
+                print(f"API Error in get_more_data: {e}")
                 return []
-                
-            end_index = min(start_index + batch_size, len(data))
-            next_batch = data[start_index:end_index]
-            
-            print(f"Returning {len(next_batch)} additional rows")
-            return next_batch
-            
-        except Exception as e:
-            print(f"API Error in get_more_data: {e}")
-            return []
     
     def get_test_data(self):
         try:
             print("API: get_test_data() called. Pushing pre-loaded test data to predictions view.")
+            self._wait_until_ready()
             if self.window:
                 self.window.evaluate_js(f'renderPredictionsTable({core.data_holder.TEST_DATA_JSON})')
         except Exception as e:
@@ -153,14 +252,17 @@ class Api:
                 error_message = json.dumps(f"Error fetching test data: {e}")
                 self.window.evaluate_js(f'renderPredictionsError({error_message})')
 
-    def get_prediction(self, home_team: str, away_team: str, date: str):
+    @instrumented('Api.get_prediction')
+    def get_prediction(self, home_team: str, away_team: str, date: str, model_id: str = None):
+        """Predicted and actual goals of one test fixture; `model_id` picks the model (see get_models)."""
+        self._wait_until_ready()
         # --- KEY CHANGE ---
-        # Use the global instance from the module.
-        if not core.model_trainer.model_instance:
-            return {"error": "Prediction model is not available."}
+        # Use the model registry from the module.
+        model = core.model_trainer.get_model(model_id)
+        if not model:
+            return {"error": self._missing_model_error(model_id)}
         try:
-            # Use the global instance from the module.
-            pred_h, pred_a, real_h, real_a = core.model_trainer.model_instance.predict(home_team, away_team, date)
+            pred_h, pred_a, real_h, real_a = model.predict(home_team, away_team, date)
             if pred_h is None:
                 return {"error": f"Match not found for {home_team} vs {away_team} on {date} in the test dataset."}
             result = {
@@ -174,5 +276,64 @@ class Api:
             print(f"API Error in get_prediction: {e}")
             return {"error": "An unexpected error occurred during prediction."}
 
+    @instrumented('Api.get_predictions')
+    def get_predictions(self, fixtures=None, model_id=None, outcomes=False):
+        """
+        Scores a list of fixtures (or the whole test split if None) in one call.
+        Each fixture is a dict with home_team, away_team and date ('dd/mm/yy').
+        With `outcomes`, 1X2, over/under and both-teams-score probabilities are added.
+        """
+        self._wait_until_ready()
+        model = core.model_trainer.get_model(model_id)
+        if not model:
+            return {"error": self._missing_model_error(model_id)}
+        try:
+            result = model.predict_batch(fixtures, outcomes)
+            if result is None:
+                return {"error": "Prediction model or test dataset is not loaded."}
+            return result
+        except Exception as e:
+            print(f"API Error in get_predictions: {e}")
+            return {"error": "An unexpected error occurred during batch prediction."}
+
+    @staticmethod
+    def _missing_model_error(model_id):
+        if model_id is None:
+            return "Prediction model is not available."
+        return f"Model '{model_id}' is not available."
+
     def check_processed_data(self):
-        return DataManager().check_file_exists()
\ No newline at end of file
+        # Solo lee el manifiesto: se usa al arrancar, antes de cargar pandas
+        return ProcessedStore(self.processed_data_path, PROCESSED_RETENTION).exists()
+
+    def set_memory_tracing(self, enabled: bool):
+        """
+        Turns tracemalloc memory tracing of the stages on or off (see INSTRUMENT_MEMORY).
+        It makes the pipeline about 3x slower, so it is off unless asked for.
+        """
+        recorder.trace_memory = bool(enabled)
+        return {"memory_tracing": recorder.trace_memory}
+
+    def get_stage_metrics(self, limit=100, stage=None):
+        """
+        Timing, rows and memory of the latest pipeline, model and API stages
+        (the same entries written to data/logs/stages.jsonl), plus per-stage aggregates.
+        """
+        return {"records": recorder.recent(limit, stage), "summary": recorder.summary()}
+
+    def get_models(self):
+        """Loaded models by id, with their MAE / RMSE on the test split, and the default id."""
+        self._wait_until_ready()
+        registry = core.model_trainer.registry
+        if registry is None:
+            return {"error": "Prediction model is not available."}
+        return {"default": registry.default, "models": registry.metrics()}
+
+    def get_model_report(self, model_id=None):
+        """Walk-forward cross-validation report (MAE / RMSE per fold) of a loaded model."""
+        self._wait_until_ready()
+        model = core.model_trainer.get_model(model_id)
+        if not model:
+            return {"error": self._missing_model_error(model_id)}
+        report = model.cv_report
+        return report if report is not None else {"error": "The loaded model has no validation report."}
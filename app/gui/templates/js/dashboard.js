@@ -148,12 +148,16 @@ function initializeDashboard() {
         loadingMessage.style.display = 'block';
     };
 
-    // 2. Solicitamos los datos a Python (llamada "dispara y olvida").
-    try {
-        loadingMessage.textContent = 'Requesting data from Python...';
-        loadingMessage.style.display = 'block';
-        pywebview.api.get_data();
-    } catch (e) {
-        renderDashboardError(`Failed to call API: ${e.message}`);
-    }
+    // 2. Mientras el backend carga datos y modelo se muestra el estado de carga;
+    //    después solicitamos los datos a Python (llamada "dispara y olvida").
+    loadingMessage.textContent = 'Loading data and model in the background...';
+    loadingMessage.style.display = 'block';
+    whenBackendReady(() => {
+        try {
+            loadingMessage.textContent = 'Requesting data from Python...';
+            pywebview.api.get_data();
+        } catch (e) {
+            renderDashboardError(`Failed to call API: ${e.message}`);
+        }
+    });
 }
\ No newline at end of file
@@ -1,3 +1,37 @@
+// Python llama a esta función cuando termina la carga en segundo plano de datos y modelo
+window.backendStatus = { ready: false };
+window.onBackendReady = (status) => {
+    console.log('Backend ready:', status);
+    window.backendStatus = status;
+    window.dispatchEvent(new CustomEvent('backendready', { detail: status }));
+};
+
+// Ejecuta callback(status) cuando el backend está listo; si la carga terminó antes de
+// que existiera la página, get_status lo confirma y no hace falta esperar al evento
+window.whenBackendReady = (callback) => {
+    if (window.backendStatus.ready) {
+        callback(window.backendStatus);
+        return;
+    }
+    let done = false;
+    const run = (status) => {
+        if (done) return;
+        done = true;
+        window.removeEventListener('backendready', onReady);
+        callback(status);
+    };
+    const onReady = (event) => run(event.detail);
+    window.addEventListener('backendready', onReady);
+    pywebview.api.get_status()
+        .then(status => {
+            if (status && status.ready) {
+                window.backendStatus = status;
+                run(status);
+            }
+        })
+        .catch(error => console.error('Error checking backend status:', error));
+};
+
 window.addEventListener('pywebviewready', () => {
     const sidebarContainer = document.getElementById('sidebar-container');
     const mainContent = document.getElementById('main-content');
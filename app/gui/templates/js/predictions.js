@@ -228,11 +228,15 @@ function initializePredictions() {
         loadingMessage.style.display = 'block';
     };
 
-    // Solicitamos los datos de prueba a Python
-    try {
-        loadingMessage.style.display = 'block';
-        pywebview.api.get_test_data();
-    } catch (e) {
-        renderPredictionsError(`Failed to call API: ${e.message}`);
-    }
+    // Solicitamos los datos de prueba a Python cuando el backend ha terminado de cargar
+    loadingMessage.textContent = 'Loading data and model in the background...';
+    loadingMessage.style.display = 'block';
+    whenBackendReady(() => {
+        try {
+            loadingMessage.textContent = 'Loading test data...';
+            pywebview.api.get_test_data();
+        } catch (e) {
+            renderPredictionsError(`Failed to call API: ${e.message}`);
+        }
+    });
 }
\ No newline at end of file
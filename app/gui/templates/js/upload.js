@@ -52,26 +52,42 @@ document.addEventListener('DOMContentLoaded', () => {
         processBtn.disabled = true;
         processBtn.textContent = 'Processing...';
         
-        // KEY CHANGE: Use .then() for a non-blocking call.
-        // This fires the Python function and immediately continues, avoiding the race condition.
-        // Python will handle navigation on success. We only care about the result if it's an error.
+        // Python queues the work in a background job and returns immediately.
+        // Progress arrives through window.onProcessingProgress; Python navigates on success.
         pywebview.api.process_files(loadedFiles).then(result => {
-            // This block will only run if Python returns a value, which it now only does on error.
-            if (result && result.status === 'error') {
+            if (result && (result.status === 'error' || result.status === 'info')) {
                 console.error("Processing failed:", result.message);
                 alert(`Processing failed: ${result.message}`);
-                processBtn.disabled = false;
-                processBtn.textContent = 'Process Files';
+                resetProcessButton();
+            } else if (result && result.status === 'duplicate') {
+                console.log(result.message);
             }
         }).catch(error => {
             // This catches fundamental errors in the API call itself.
             console.error('Error calling process_files API:', error);
             alert('A critical error occurred while trying to process the files.');
-            processBtn.disabled = false;
-            processBtn.textContent = 'Process Files';
+            resetProcessButton();
         });
     });
 
+    // Python llama a esta función con el estado del trabajo de procesamiento
+    window.onProcessingProgress = (job) => {
+        if (job.status === 'running' || job.status === 'queued') {
+            const percent = Math.round((job.progress || 0) * 100);
+            processBtn.textContent = job.stage ? `Processing... ${job.stage} (${percent}%)` : 'Processing...';
+        } else if (job.status === 'error') {
+            alert(`Processing failed: ${job.error}`);
+            resetProcessButton();
+        } else if (job.status === 'cancelled') {
+            resetProcessButton();
+        }
+    };
+
+    function resetProcessButton() {
+        processBtn.disabled = false;
+        processBtn.textContent = 'Process Files';
+    }
+
     // --- LÓGICA DE DRAG & DROP ---
 
     dropZone.addEventListener('dragover', (event) => {
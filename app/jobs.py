@@ -0,0 +1,142 @@
+import itertools
+import queue
+import threading
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
+
+class Job:
+    def __init__(self, job_id, kind, fingerprint, target, args):
+        self.id = job_id
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.target = target
+        self.args = args
+        self.status = 'queued'
+        self.stage = None
+        self.progress = 0.0
+        self.error = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': self.progress,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """
+    Cola de trabajos con un único hilo trabajador.
+
+    Los trabajos se ejecutan de uno en uno, así que dos procesamientos nunca compiten
+    por data/processed ni data/models. Un trabajo idéntico (misma huella) a uno en
+    cola o en ejecución se rechaza; cualquier otro se encola con sus propios
+    argumentos, porque sustituir uno en cola perdería lo que su llamada envió (p. ej.
+    ficheros subidos que aún no se han escrito). Cada cambio de estado se notifica a
+    `on_update(job_dict)`.
+    """
+
+    def __init__(self, on_update=None):
+        self.on_update = on_update
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._current = None
+        self._worker = threading.Thread(target=self._run, name='job-worker', daemon=True)
+        self._worker.start()
+
+    def submit(self, kind, target, args=(), fingerprint=None):
+        """
+        Queues `target(job, *args)`.
+
+        Returns:
+            tuple: (Job, accepted). accepted is False when the submission was a duplicate
+            of a queued or running job, which is returned instead.
+        """
+        with self._lock:
+            for job in self._active_jobs():
+                if job.kind == kind and fingerprint is not None and job.fingerprint == fingerprint:
+                    print(f"JOBS: Duplicate '{kind}' submission ignored (job {job.id}).")
+                    return job, False
+
+            job = Job(next(self._ids), kind, fingerprint, target, args)
+            self._jobs[job.id] = job
+            self._queue.put(job)
+        self._notify(job)
+        return job, True
+
+    def cancel(self, job_id=None):
+        """Cancels a job (by default the running one). Returns False if there was nothing to cancel."""
+        with self._lock:
+            job = self._jobs.get(job_id) if job_id is not None else self._current
+            if job is None or job.status not in ('queued', 'running'):
+                return False
+            job.cancel()
+            if job.status == 'queued':
+                job.status = 'cancelled'
+        self._notify(job)
+        return True
+
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    def report(self, job, stage, progress):
+        """Called from the job to report that `stage` started; also acts as a cancel point."""
+        job.check_cancelled()
+        job.stage = stage
+        job.progress = progress
+        self._notify(job)
+
+    def _active_jobs(self):
+        return [job for job in self._jobs.values() if job.status in ('queued', 'running')]
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                if job.cancelled:
+                    continue
+                job.status = 'running'
+                self._current = job
+            self._notify(job)
+            try:
+                job.target(job, *job.args)
+                job.status = 'done'
+                job.progress = 1.0
+            except JobCancelled:
+                job.status = 'cancelled'
+            except Exception as e:
+                print(f"JOBS: Job {job.id} failed: {e}")
+                job.status = 'error'
+                job.error = str(e)
+            finally:
+                with self._lock:
+                    self._current = None
+            self._notify(job)
+
+    def _notify(self, job):
+        if self.on_update is not None:
+            try:
+                self.on_update(job.to_dict())
+            except Exception as e:
+                print(f"JOBS: Could not report progress: {e}")
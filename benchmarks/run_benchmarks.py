@@ -0,0 +1,253 @@
+"""
+Benchmarks del pipeline de features y del modelo sobre ligas sintéticas.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.run_benchmarks --teams 20 --seasons 10 --leagues 2
+    python -m benchmarks.run_benchmarks --scaling 1,2,4,8
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --tolerance 0.25
+
+Cada etapa se mide en tiempo de reloj (mejor de --repeat ejecuciones), filas por
+segundo y pico de memoria (tracemalloc, en una ejecución aparte para no falsear
+los tiempos). Con --baseline se compara el throughput con una ejecución guardada y
+el proceso termina con código 1 si alguna etapa empeora más que --tolerance.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import write_league_history
+from core.config import N, FEATURES_COLUMNS
+from core.data_view import DataPager
+from core.features import (
+    AvgGoalsCalculator,
+    StreaksCalculator,
+    AvgShotsCalculator,
+    AvgCornersCalculator,
+    AvgPointsCalculator,
+    EfficiencyCalculator,
+    EwmFormCalculator,
+    TeamHistory
+)
+from core.features.utils import get_historical
+from core.instrumentation import recorder
+from core.pre_processor import PreProcessor
+from core.store import ProcessedStore
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# get_historical() es O(filas) por llamada; se mide sobre una muestra
+GET_HISTORICAL_SAMPLE = 200
+# Columnas que los calculadores piden a TeamHistory (medias, eficiencia y puntos)
+HISTORY_COLUMNS = ['goals_for', 'goals_against', 'shots_for', 'shots_against',
+                   'corners_for', 'corners_against', 'points']
+
+
+def measure(fn, repeat):
+    """Returns (best wall time in seconds, peak traced memory in bytes, last result)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def team_history_pass(raw):
+    """What the calculators ask of TeamHistory: build it, then every window sum, count and streak."""
+    history = TeamHistory(raw, N)
+    counts = history.counts()
+    sums = [(history.rolling_sum(column), history.rolling_count(column)) for column in HISTORY_COLUMNS]
+    return counts, sums, history.streaks('win')
+
+
+def run_pipeline_stages(data_dir, repeat):
+    """Times every stage of the pipeline on the CSV files in `data_dir`."""
+    results = {}
+
+    def record(name, fn, rows):
+        seconds, peak, value = measure(fn, repeat)
+        results[name] = {
+            'seconds': seconds,
+            'rows': rows,
+            'rows_per_s': rows / seconds if seconds > 0 else float('inf'),
+            'peak_bytes': peak
+        }
+        return value
+
+    raw = PreProcessor(data_dir).get_data()
+    n_rows = len(raw)
+    record('preprocess', lambda: PreProcessor(data_dir).get_data(), n_rows)
+
+    sample = raw.iloc[::max(1, n_rows // GET_HISTORICAL_SAMPLE)].head(GET_HISTORICAL_SAMPLE)
+    record('get_historical', lambda: [get_historical(row, raw, N) for _, row in sample.iterrows()], len(sample))
+
+    record('team_history', lambda: team_history_pass(raw), n_rows)
+    calculators = [AvgGoalsCalculator, StreaksCalculator, AvgShotsCalculator,
+                   AvgCornersCalculator, AvgPointsCalculator, EfficiencyCalculator, EwmFormCalculator]
+    for calculator in calculators:
+        record(calculator.__name__, lambda c=calculator: c().compute(raw, N), n_rows)
+
+    def fused():
+        history = TeamHistory(raw, N)
+        blocks = [c().compute(raw, N, history) for c in calculators]
+        return pd.concat([raw] + blocks, axis=1)
+
+    processed = record('features_fused', fused, n_rows)
+
+    from core.models.multiple_linear_regression import MultipleLinearRegressionModel
+    from core.models.registry import ModelRegistry
+    # La importación de sklearn no forma parte del coste de entrenar
+    import sklearn.linear_model  # noqa: F401
+    import sklearn.model_selection  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+
+    def train():
+        model = MultipleLinearRegressionModel()
+        model.train(processed)
+        return model
+
+    model = record('model_train', train, len(processed.dropna()))
+    # Todos los modelos de MODELS sobre una matriz compartida, en paralelo
+    record('registry_train', lambda: ModelRegistry().train(processed), len(processed.dropna()))
+    fixtures = list(zip(model.df_test['HomeTeam'], model.df_test['AwayTeam'],
+                        model.df_test['Date'].dt.strftime('%d/%m/%y')))
+    record('model_predict', lambda: [model.predict(*f) for f in fixtures], len(fixtures))
+    record('model_predict_batch', lambda: model.predict_batch(fixtures), len(fixtures))
+    record('score_matrix', lambda: model.predict_batch(outcomes=True), len(fixtures))
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = ProcessedStore(store_dir, retention=1)
+        store.save(processed)
+        record('processed_load', store.load, n_rows)
+    # Igual que DataManager.get_data_as_json: fechas como texto
+    record('processed_json', lambda: processed.assign(Date=processed['Date'].dt.strftime('%Y-%m-%d'))
+           .to_json(orient='records'), n_rows)
+    pager = DataPager(processed)
+    record('pager_page', lambda: pager.page(0, 100), 100)
+    return results
+
+
+def run_scaling(teams, seasons_list, leagues, repeat, seed):
+    """Preprocess + fused features for growing numbers of seasons."""
+    curve = []
+    for seasons in seasons_list:
+        with tempfile.TemporaryDirectory() as data_dir:
+            rows = write_league_history(data_dir, teams=teams, seasons=seasons, leagues=leagues, seed=seed)
+
+            def pipeline():
+                data = PreProcessor(data_dir).get_data()
+                history = TeamHistory(data, N)
+                return [c().compute(data, N, history) for c in
+                        (AvgGoalsCalculator, StreaksCalculator, AvgShotsCalculator,
+                         AvgCornersCalculator, AvgPointsCalculator, EfficiencyCalculator, EwmFormCalculator)]
+
+            seconds, peak, _ = measure(pipeline, repeat)
+        curve.append({'seasons': seasons, 'rows': rows, 'seconds': seconds,
+                      'rows_per_s': rows / seconds, 'peak_bytes': peak})
+    return curve
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Returns the stages whose throughput dropped more than `tolerance` below the baseline."""
+    regressions = []
+    for stage, current in results.items():
+        reference = baseline.get('stages', {}).get(stage)
+        if reference is None:
+            continue
+        if current['rows_per_s'] < reference['rows_per_s'] * (1 - tolerance):
+            regressions.append((stage, reference['rows_per_s'], current['rows_per_s']))
+    return regressions
+
+
+def print_stages(results):
+    print(f"{'stage':<22}{'rows':>9}{'seconds':>11}{'rows/s':>14}{'peak MB':>10}")
+    for stage, r in results.items():
+        print(f"{stage:<22}{r['rows']:>9}{r['seconds']:>11.4f}{r['rows_per_s']:>14.0f}{r['peak_bytes'] / 1e6:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the feature pipeline and the goal model.")
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scaling', type=str, default=None,
+                        help="Comma separated season counts for a scaling curve, e.g. 1,2,4,8")
+    parser.add_argument('--baseline', type=str, default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, default=None,
+                        help=f"Write the results as the new baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed throughput drop against the baseline (0.25 = 25%%)")
+    parser.add_argument('--output', type=str, default=None, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+    # La instrumentación de la aplicación usaría tracemalloc a la vez que measure()
+    recorder.trace_memory = False
+    recorder.log_path = None
+
+    config = {'teams': args.teams, 'seasons': args.seasons, 'leagues': args.leagues,
+              'seed': args.seed, 'n_matches': N, 'n_features': len(FEATURES_COLUMNS)}
+    with tempfile.TemporaryDirectory() as data_dir:
+        rows = write_league_history(data_dir, teams=args.teams, seasons=args.seasons,
+                                    leagues=args.leagues, seed=args.seed)
+        print(f"Synthetic history: {rows} matches "
+              f"({args.leagues} leagues x {args.seasons} seasons x {args.teams} teams)")
+        stages = run_pipeline_stages(data_dir, args.repeat)
+    print_stages(stages)
+    report = {'config': config, 'stages': stages}
+
+    if args.scaling:
+        seasons_list = [int(s) for s in args.scaling.split(',') if s.strip()]
+        report['scaling'] = run_scaling(args.teams, seasons_list, args.leagues, args.repeat, args.seed)
+        print(f"\n{'seasons':>8}{'rows':>9}{'seconds':>11}{'rows/s':>14}{'peak MB':>10}")
+        for point in report['scaling']:
+            print(f"{point['seasons']:>8}{point['rows']:>9}{point['seconds']:>11.4f}"
+                  f"{point['rows_per_s']:>14.0f}{point['peak_bytes'] / 1e6:>10.2f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != config:
+            print("\nWarning: baseline was recorded with a different configuration.")
+        regressions = compare_with_baseline(stages, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for stage, before, now in regressions:
+                print(f"  {stage}: {before:.0f} -> {now:.0f} rows/s")
+            exit_code = 1
+        else:
+            print("\nNo regressions against the baseline.")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
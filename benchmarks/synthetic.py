@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Mismo esquema de columnas que data/default_datasets
+COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR',
+           'Referee', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+
+
+def generate_season(teams, season_start, rng):
+    """Double round-robin season: every team hosts every other team once, one round per week."""
+    n_teams = len(teams)
+    rotation = list(teams) + ([None] if n_teams % 2 else [])
+    rounds = []
+    for _ in range(len(rotation) - 1):
+        half = len(rotation) // 2
+        pairs = [(rotation[i], rotation[-1 - i]) for i in range(half)]
+        rounds.append([p for p in pairs if None not in p])
+        rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+    rounds += [[(away, home) for home, away in round_] for round_ in rounds]
+
+    rows = []
+    for week, round_ in enumerate(rounds):
+        date = season_start + pd.Timedelta(weeks=week)
+        for home, away in round_:
+            fthg, ftag = rng.poisson(1.5), rng.poisson(1.1)
+            hthg, htag = rng.binomial(fthg, 0.45), rng.binomial(ftag, 0.45)
+            hs, as_ = fthg + rng.poisson(11), ftag + rng.poisson(9)
+            rows.append([
+                date.strftime('%d/%m/%y'), home, away, fthg, ftag,
+                'H' if fthg > ftag else 'A' if ftag > fthg else 'D',
+                hthg, htag, 'H' if hthg > htag else 'A' if htag > hthg else 'D',
+                '', hs, as_, rng.binomial(hs, 0.35), rng.binomial(as_, 0.35),
+                rng.poisson(12), rng.poisson(12), rng.poisson(5), rng.poisson(4),
+                rng.poisson(2), rng.poisson(2), rng.binomial(1, 0.05), rng.binomial(1, 0.05)
+            ])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def generate_league_history(teams=20, seasons=5, leagues=1, seed=0, first_year=2000):
+    """
+    Generates synthetic league histories.
+
+    Returns:
+        dict: {(league, season): DataFrame} with one season file per league and year.
+    """
+    rng = np.random.default_rng(seed)
+    history = {}
+    for league in range(leagues):
+        names = [f'L{league} Team {i:02d}' for i in range(teams)]
+        for season in range(seasons):
+            start = pd.Timestamp(year=first_year + season, month=8, day=15)
+            history[(league, season)] = generate_season(names, start, rng)
+    return history
+
+
+def write_league_history(directory, **kwargs):
+    """Writes generate_league_history() as CSV files in `directory`. Returns the total rows."""
+    os.makedirs(directory, exist_ok=True)
+    total = 0
+    for (league, season), df in generate_league_history(**kwargs).items():
+        df.to_csv(os.path.join(directory, f'league-{league}-season-{season:03d}.csv'), index=False)
+        total += len(df)
+    return total
@@ -1,3 +1,13 @@
-from .data_manager import DataManager
-from .data_manager import DataType
-from .pre_processor import PreProcessor
\ No newline at end of file
+# Importaciones diferidas: `import core` no carga pandas hasta que se usa una clase
+_EXPORTS = {
+    'DataManager': '.data_manager',
+    'DataType': '.data_manager',
+    'PreProcessor': '.pre_processor',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import pandas as pd
+
+from .store import write_json_atomic
+
+
+class NormalizedFrameCache:
+    """
+    Caché en disco de los dataframes normalizados de cada fichero de temporada.
+
+    La clave es el hash del contenido del fichero más la configuración que afecta
+    a la normalización, así que un fichero que no ha cambiado no se vuelve a
+    interpretar. Cuando el tamaño total supera `max_bytes` se eliminan las
+    entradas usadas hace más tiempo (LRU).
+    """
+
+    INDEX_NAME = 'index.json'
+
+    def __init__(self, directory: str, max_bytes: int, config_key: str = ''):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.config_key = config_key
+        self.index_path = os.path.join(directory, self.INDEX_NAME)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._read_index()
+
+    def key_for(self, file_path: str) -> str:
+        digest = hashlib.sha256(self.config_key.encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Returns the cached dataframe for `key`, or None on a miss."""
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index[key]['last_used'] = time.time()
+        try:
+            return pd.read_pickle(self._entry_path(key))
+        # Entradas truncadas, corruptas o escritas con otra versión de pandas: se recalculan
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            print(f"Discarding unreadable cache entry {key}: {e}")
+            with self._lock:
+                self._index.pop(key, None)
+                # Fuera del índice el fichero ya no contaría para max_bytes: se borra, como en _evict
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+            return None
+
+    def put(self, key: str, df: pd.DataFrame):
+        path = self._entry_path(key)
+        tmp_path = path + '.tmp'
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._index[key] = {'bytes': os.path.getsize(path), 'last_used': time.time()}
+            self._evict()
+
+    def flush(self):
+        """Persists the index (sizes and last access times)."""
+        with self._lock:
+            write_json_atomic(self.index_path, self._index)
+
+    def _evict(self):
+        total = sum(entry['bytes'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['bytes']
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def _read_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Solo se conservan las entradas cuyo fichero sigue existiendo
+        return {k: v for k, v in index.items() if os.path.exists(self._entry_path(k))}
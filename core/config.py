@@ -9,6 +9,58 @@ AVG_SHOTS_COLUMNS = ['H_AvgShots', 'H_AvgShotsAgainst', 'A_AvgShots', 'A_AvgShot
 AVG_CORNERS_COLUMNS = ['H_AvgCorners', 'H_AvgCornersAgainst', 'A_AvgCorners', 'A_AvgCornersAgainst']
 AVG_POINTS_COLUMNS = ['H_Points', 'A_Points']
 EFFICIENCY_COLUMNS = ['H_Eff_GoalsPerShot', 'A_Eff_GoalsPerShot']
+# Rachas disponibles en StreaksCalculator; solo la de victorias forma parte de FEATURES_COLUMNS
+STREAK_KINDS_COLUMNS = {
+    'win': STREAK_COLUMNS,
+    'unbeaten': ['H_UnbeatenStreak', 'A_UnbeatenStreak'],
+    'losing': ['H_LosingStreak', 'A_LosingStreak'],
+    'scoring': ['H_ScoringStreak', 'A_ScoringStreak'],
+    'clean_sheet': ['H_CleanSheetStreak', 'A_CleanSheetStreak'],
+}
+# Medias con decaimiento exponencial (EwmFormCalculator); no forman parte de FEATURES_COLUMNS
+EWM_FORM_COLUMNS = [f'{side}_Ewm{stat}' for side in ('H', 'A') for stat in
+                    ('Goals', 'GoalsAgainst', 'Shots', 'ShotsAgainst', 'Corners', 'CornersAgainst', 'Points')]
 FEATURES_COLUMNS = STREAK_COLUMNS + AVG_GOALS_COLUMNS + AVG_SHOTS_COLUMNS + AVG_CORNERS_COLUMNS + AVG_POINTS_COLUMNS + EFFICIENCY_COLUMNS
 
-N_SPLITS = 10
\ No newline at end of file
+N_SPLITS = 10
+# Olvido exponencial del modelo lineal: peso de cada partido respecto al siguiente
+# (1.0 = todos pesan igual; 0.999 ≈ la mitad de peso cada ~700 partidos)
+MODEL_FORGETTING = 1.0
+
+# Modelos que se entrenan y cargan (core/models/registry.py); el primero es el de por defecto
+MODELS = ['linear', 'ridge', 'poisson', 'gbm']
+# Hilos para entrenar los modelos en paralelo sobre la misma matriz (None = uno por modelo)
+MODEL_WORKERS = None
+RIDGE_ALPHA = 1.0
+POISSON_ALPHA = 1e-3
+# Matriz de marcadores (core/models/score_matrix.py): goles máximos por equipo (la última
+# fila/columna acumula "k o más") y líneas de más/menos goles
+SCORE_MATRIX_MAX_GOALS = 10
+OVER_UNDER_LINES = [1.5, 2.5, 3.5]
+GBM_PARAMS = {'learning_rate': 0.05, 'max_iter': 200, 'max_leaf_nodes': 15,
+              'early_stopping': False, 'random_state': 0}
+# Número de versiones de datos procesados que se conservan en data/processed
+PROCESSED_RETENTION = 3
+# Número de versiones de modelos (con su partición de prueba) que se conservan en data/models
+MODEL_RETENTION = 3
+
+# Tamaño máximo de la caché de ficheros normalizados (data/cache), en bytes
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Ventanas (nº de partidos previos) para las que se calculan las features en una sola pasada.
+# N siempre se calcula y conserva los nombres de FEATURES_COLUMNS; el resto lleva el sufijo _w<n>
+FEATURE_WINDOWS = [N]
+
+# Vida media, en partidos del propio equipo, de las medias exponenciales de forma
+EWM_HALF_LIFE = 3
+
+# Procesos usados para calcular las features por bloques (1 = sin paralelismo)
+FEATURE_WORKERS = 1
+
+# Instrumentación por etapas (data/logs/stages.jsonl): traza de memoria con tracemalloc
+# (hace el pipeline unas 3 veces más lento, así que solo se activa a propósito: aquí o con
+# Api.set_memory_tracing; False deja solo tiempos y filas),
+# etapas que se guardan en memoria para la API y tamaño máximo del log antes de rotarlo
+INSTRUMENT_MEMORY = False
+STAGE_HISTORY = 500
+STAGE_LOG_MAX_BYTES = 5 * 1024 * 1024
@@ -1,25 +1,43 @@
-from .data_manager import DataManager, DataType
+# Datos procesados como dataframe tipado; las páginas se serializan bajo demanda con PAGER
+PROCESSED_DATA = None
+PAGER = None
+# Los datos de prueba son pequeños y se guardan directamente como string JSON
+TEST_DATA_JSON = '{"error": "No test data found."}'
 
-print("DATA_HOLDER: Initializing and pre-loading data into memory...")
 
-# Variables globales para almacenar los datos como strings JSON
-PROCESSED_DATA_JSON = '{"error": "No processed data found."}'
-TEST_DATA_JSON = '{"error": "No test data found."}'
+def set_processed_data(df):
+    """Replaces the in-memory processed data and its pager."""
+    global PROCESSED_DATA, PAGER
+    from .data_view import DataPager
+
+    PROCESSED_DATA = df
+    PAGER = DataPager(df) if df is not None else None
+
+
+def load():
+    """
+    Pre-loads the processed and test data into memory. Called from the background
+    startup thread instead of at import time, so the window can open first.
+    """
+    global TEST_DATA_JSON
+    from .data_manager import DataManager, DataType
+
+    print("DATA_HOLDER: Initializing and pre-loading data into memory...")
+    try:
+        # Creamos una única instancia de DataManager para usarla aquí
+        data_loader = DataManager()
+
+        # Precargamos los datos procesados
+        if data_loader.check_file_exists():
+            data_loader.load_data()
+            set_processed_data(data_loader.data)
+            print("DATA_HOLDER: Processed data pre-loaded successfully.")
+        else:
+            print("DATA_HOLDER: No processed data file found to pre-load.")
+
+        # Precargamos los datos de prueba
+        TEST_DATA_JSON = data_loader.get_data_as_json(DataType.TEST)
+        print("DATA_HOLDER: Test data pre-loaded successfully.")
 
-try:
-    # Creamos una única instancia de DataManager para usarla aquí
-    data_loader = DataManager()
-    
-    # Precargamos los datos procesados
-    if data_loader.check_file_exists():
-        PROCESSED_DATA_JSON = data_loader.get_data_as_json()
-        print("DATA_HOLDER: Processed data pre-loaded successfully.")
-    else:
-        print("DATA_HOLDER: No processed data file found to pre-load.")
-
-    # Precargamos los datos de prueba
-    TEST_DATA_JSON = data_loader.get_data_as_json(DataType.TEST)
-    print("DATA_HOLDER: Test data pre-loaded successfully.")
-
-except Exception as e:
-    print(f"DATA_HOLDER: FAILED to pre-load data. Error: {e}")
\ No newline at end of file
+    except Exception as e:
+        print(f"DATA_HOLDER: FAILED to pre-load data. Error: {e}")
@@ -1,19 +1,39 @@
 import os
-import glob
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from enum import Enum
 from .pre_processor import PreProcessor
+from .store import ProcessedStore, ModelStore
+from .cache import NormalizedFrameCache
+from .instrumentation import stage
 from .features import (
     AvgGoalsCalculator,
     StreaksCalculator,
     AvgShotsCalculator,
     AvgCornersCalculator,
     AvgPointsCalculator,
-    EfficiencyCalculator
+    EfficiencyCalculator,
+    EwmFormCalculator,
+    TeamHistory,
+    TeamState
 )
-from datetime import datetime
+from .features.sharding import shard_bounds, history_positions
+from .features.utils import window_columns
 # ¡CLAVE! Importamos las constantes para usarlas al eliminar columnas
-from .config import N, HOME_TARGET, AWAY_TARGET, RESULT_COLUMN
+from .config import N, HOME_TARGET, AWAY_TARGET, RESULT_COLUMN, PROCESSED_RETENTION, MODEL_RETENTION, CACHE_MAX_BYTES, FEATURE_WORKERS, FEATURE_WINDOWS, EWM_HALF_LIFE
+
+class ProcessingCancelled(Exception):
+    """Raised from a progress callback to stop processing between stages."""
+
+
+def _compute_shard(frame, n_history, windows):
+    """Worker entry point: features of `frame`, skipping its first `n_history` rows."""
+    history = TeamHistory(frame, max(windows))
+    blocks = [DataManager._window_block(calculator, frame, window, history)
+              for calculator in DataManager._calculators() if not calculator.streaming
+              for window in windows]
+    return pd.concat(blocks, axis=1).iloc[n_history:]
+
 
 class DataType(Enum):
     RAW = 'raw'
@@ -22,10 +42,7 @@ class DataType(Enum):
     # PROCESSED = 'processed'
 class DataManager: 
 
-    def __init__(self, data_type=DataType.RAW):
-        date = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        self.save_data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'processed', (date + '.csv'))
-
+    def __init__(self, data_type=DataType.RAW, progress=None, windows=None):
         if data_type == DataType.RAW:
             self.working_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'raw')
         elif data_type == DataType.DEFAULT:
@@ -36,23 +53,192 @@ class DataManager:
         self.processed_data_path = os.path.join('data', 'processed')
         self.raw_data_path = os.path.join('data', 'raw')
         self.default_data_path = os.path.join('data', 'default_datasets')
+        # La partición de prueba vive en la versión actual de los modelos; data/test es la de antes del manifiesto
         self.test_data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'test')
+        self.models_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'models')
+        # Estado suelto de antes de guardarlo con cada versión; solo se lee como respaldo
+        self.state_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'processed', 'team_state.json')
+        self.store = ProcessedStore(
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'processed'),
+            PROCESSED_RETENTION
+        )
+        self.cache_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'cache')
+        self.data = None
+        self.team_state = None
+        # Estado final de EwmFormCalculator; se guarda con TeamState para el modo incremental
+        self.form_state = None
+        # Callback opcional progress(stage) llamado al empezar cada etapa
+        self.progress = progress
+        # Ventanas de features; N siempre está incluida porque el modelo la usa
+        self.windows = sorted(set(windows or FEATURE_WINDOWS) | {N})
         # Asegurarse de que los directorios existan al iniciar
         os.makedirs(self.processed_data_path, exist_ok=True)
         os.makedirs(self.raw_data_path, exist_ok=True)
 
 
-    def process_data(self):
+    def process_data(self, fused=True, workers=None):
+        """
+        Runs the pre-processing and every feature calculator.
+
+        In fused mode (default) the team history is built once, every calculator
+        computes only its own column block and all blocks are attached to the
+        matches in a single concat. Otherwise each calculator appends its columns
+        one after another; both modes produce the same dataframe.
+
+        Every window in `self.windows` is computed from the same team history (built
+        for the longest one); columns of windows other than N get a `_w<n>` suffix.
+
+        With more than one worker (`workers`, default FEATURE_WORKERS) the rows are
+        split into date-aligned shards and each one is computed in a separate process,
+        receiving only the history it needs. Streaming calculators (they need the whole
+        history) run in this process. The result is identical to the serial path.
+        """
+        workers = workers or FEATURE_WORKERS
         try:
-            self.data = PreProcessor(self.working_path).get_data()
-            self.data = AvgGoalsCalculator().calculate(self.data, N)
-            self.data = StreaksCalculator().calculate(self.data, N)
-            self.data = AvgShotsCalculator().calculate(self.data, N)
-            self.data = AvgCornersCalculator().calculate(self.data, N)
-            self.data = AvgPointsCalculator().calculate(self.data, N)
-            self.data = EfficiencyCalculator().calculate(self.data, N)
+            with stage('DataManager.process_data') as record:
+                self._report('ingest')
+                self.data = PreProcessor(self.working_path, cache=self._frame_cache()).get_data()
+                record.rows = len(self.data)
+                # El historial por equipo se calcula una sola vez y lo comparten todos los calculadores
+                with stage('TeamHistory', rows=len(self.data)):
+                    history = TeamHistory(self.data, max(self.windows))
+                    self.team_state = TeamState.from_history(history)
+                if workers > 1:
+                    self.data = self._compute_features_sharded(self.data, workers)
+                else:
+                    self.data = self._compute_features(self.data, history, fused)
+                self.team_state.form = self.form_state
+        except ProcessingCancelled:
+            raise
         except Exception as e:
             print(f"Error processing data: {e}")
+
+    def process_incremental(self, data_files=None):
+        """
+        Computes features only for matches after the stored team state watermark and
+        saves the processed data with them appended as a new version.
+
+        Returns:
+            bool: False if the incremental path cannot be used (no stored state, or some
+            of the matches are not after the watermark) and a full rebuild is needed.
+        """
+        with stage('DataManager.process_incremental') as record:
+            return self._process_incremental(data_files, record)
+
+    def _process_incremental(self, data_files, record):
+        state = self._load_state()
+        if state is None or state.n_matches != max(self.windows) or \
+                state.form is None or state.form.get('half_life') != EWM_HALF_LIFE:
+            print("No compatible team state found. A full rebuild is required.")
+            return False
+
+        self._report('ingest')
+        matches = PreProcessor(self.working_path, data_files, cache=self._frame_cache()).get_data()
+        new_matches = state.filter_new(matches)
+        record.rows = len(matches)
+        if new_matches.empty or len(new_matches) != len(matches):
+            print("Some matches are not after the stored watermark. A full rebuild is required.")
+            return False
+
+        self.load_data()
+        if self.data is None:
+            return False
+
+        # Los partidos guardados en el estado bastan como historial de los nuevos
+        state_matches = state.as_matches()
+        frame = pd.concat([state_matches, new_matches], ignore_index=True)
+        # La forma exponencial parte del estado guardado y solo aplica los partidos nuevos
+        features = self._compute_features(frame, TeamHistory(frame, max(self.windows)), form=state.form)
+        if set(features.columns) != set(self.data.columns):
+            print("The stored data was processed with other feature windows. A full rebuild is required.")
+            return False
+        new_rows = features.iloc[len(state_matches):]
+        self.data = pd.concat([self.data, new_rows[self.data.columns]], ignore_index=True)
+        # Equipos nuevos amplían el diccionario compartido en lugar de volver a texto
+        self.data = PreProcessor.compact_types(self.data)
+
+        # El estado se actualiza antes de guardar: si falla, ni los datos ni el estado cambian
+        state.update(new_matches)
+        state.form = self.form_state
+        self.team_state = state
+        self.save_data()
+        print(f"Appended {len(new_rows)} new matches to the processed data")
+        return True
+
+    def _compute_features(self, matches, history, fused=True, form=None):
+        blocks = []
+        for calculator in self._calculators(form):
+            self._report(type(calculator).__name__)
+            with stage(type(calculator).__name__, rows=len(matches)):
+                # Los calculadores de flujo no dependen de N: una sola vez y sin sufijo
+                for window in self.windows if not calculator.streaming else [N]:
+                    block = self._window_block(calculator, matches, window, history)
+                    if fused:
+                        blocks.append(block)
+                    else:
+                        matches = pd.concat([matches, block], axis=1)
+            if calculator.streaming:
+                self.form_state = calculator.state
+        return pd.concat([matches] + blocks, axis=1) if fused else matches
+
+    @staticmethod
+    def _window_block(calculator, matches, window, history):
+        block = calculator.compute(matches, window, history)
+        if window != N:
+            block.columns = window_columns(block.columns, window)
+        return block
+
+    def _compute_features_sharded(self, matches, workers):
+        self._report('sharded features')
+        shards = []
+        for start, end in shard_bounds(matches['Date'], workers):
+            # Cada proceso recibe su bloque más los últimos N partidos previos de cada equipo
+            needed = history_positions(matches, start, max(self.windows))
+            frame = pd.concat([matches.iloc[needed], matches.iloc[start:end]], ignore_index=True)
+            shards.append((frame, len(needed), self.windows))
+
+        # Los procesos no comparten el registro: se mide el conjunto de todos los bloques
+        with stage('DataManager.sharded_features', rows=len(matches)), \
+                ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_compute_shard, *zip(*shards)))
+
+        features = pd.concat(results, ignore_index=True)
+        features.index = matches.index
+        blocks = [features]
+        # Los calculadores de flujo recorren todo el historial: una pasada en este proceso
+        for calculator in self._calculators():
+            if calculator.streaming:
+                self._report(type(calculator).__name__)
+                with stage(type(calculator).__name__, rows=len(matches)):
+                    blocks.append(calculator.compute(matches, N))
+                self.form_state = calculator.state
+        return pd.concat([matches] + blocks, axis=1)
+
+    def _load_state(self):
+        """Team state of the current processed version (or the loose legacy file), or None."""
+        state = self.store.load_state()
+        if state is not None:
+            return TeamState.from_dict(state)
+        return TeamState.load(self.state_path)
+
+    def _report(self, stage):
+        if self.progress is not None:
+            self.progress(stage)
+
+    def _frame_cache(self):
+        return NormalizedFrameCache(self.cache_path, CACHE_MAX_BYTES, PreProcessor.cache_config_key())
+
+    @staticmethod
+    def _calculators(form=None):
+        return [
+            AvgGoalsCalculator(),
+            StreaksCalculator(),
+            AvgShotsCalculator(),
+            AvgCornersCalculator(),
+            AvgPointsCalculator(),
+            EfficiencyCalculator(),
+            EwmFormCalculator(EWM_HALF_LIFE, form)
+        ]
     
     def get_data_as_json(self, data_type: DataType = None):
         """
@@ -62,9 +248,8 @@ class DataManager:
         """
         if data_type == DataType.TEST:
             try:
-                test_file_name = 'multiple_linear_regression_test.csv'
-                base_dir = os.path.dirname(os.path.dirname(__file__))
-                test_file_path = os.path.join(base_dir, self.test_data_path, test_file_name)
+                test_file_path = ModelStore(self.models_path, MODEL_RETENTION).current_path('test') or \
+                    os.path.join(self.test_data_path, 'multiple_linear_regression_test.csv')
 
                 print(f"Loading TEST data from: {test_file_path}")
 
@@ -91,60 +276,43 @@ class DataManager:
             print("Loading latest PROCESSED data.")
             self.load_data()
             if self.data is not None:
-                return self.data.to_json(orient='records')
+                # Las fechas se envían como texto, igual que en los ficheros procesados
+                data = self.data.assign(Date=self.data['Date'].dt.strftime('%Y-%m-%d'))
+                return data.to_json(orient='records')
             else:
                 return '{"error": "No processed data available."}'
         
     def load_data(self):
-        """ Loads the most recent processed data file."""
-        processed_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'processed')
-        
+        """ Loads the current version of the processed data."""
         try:
-            if not os.path.isdir(processed_folder) or not os.listdir(processed_folder):
-                print(f"Processed data directory is empty or not found: {processed_folder}")
-                self.data = None
-                return
-
-            csv_files = [f for f in os.listdir(processed_folder) if f.endswith('.csv')]
-            if not csv_files:
-                print(f"No CSV files found in {processed_folder}")
-                self.data = None
-                return
-
-            latest_file = max(csv_files, key=lambda f: os.path.getmtime(os.path.join(processed_folder, f)))
-            latest_file_path = os.path.join(processed_folder, latest_file)
-            
-            print(f"Loading latest processed file: {latest_file_path}")
-            self.data = pd.read_csv(latest_file_path)
-
+            with stage('ProcessedStore.load') as record:
+                self.data = self.store.load()
+                record.rows = len(self.data) if self.data is not None else 0
+            if self.data is None:
+                print(f"No processed data found in {self.store.directory}")
         except Exception as e:
-            print(f"Error loading latest data file: {e}")
+            print(f"Error loading processed data: {e}")
             self.data = None
 
     def save_data(self):
         if self.data is not None:
-            self.data.to_csv(self.save_data_path, index=False)
+            self._report('save')
+            # Los datos y el estado del modo incremental se guardan en la misma versión
+            state = self.team_state.to_dict() if self.team_state is not None else None
+            with stage('ProcessedStore.save', rows=len(self.data)):
+                self.store.save(self.data, state)
         else:
             raise ValueError("No data to save. Please load or process data first.")
         
     def check_file_exists(self):
         """
-        Checks if any .csv file exists in the processed data directory.
-        This is a robust way to check for processed data.
+        Checks if the processed data store has a current version.
         """
-        # Comprueba si el directorio existe
-        if not os.path.isdir(self.processed_data_path):
-            return False
-        
-        # Busca cualquier archivo que termine en .csv en el directorio
-        csv_files = glob.glob(os.path.join(self.processed_data_path, '*.csv'))
-        
-        # Si la lista de archivos CSV no está vacía, significa que hay datos.
-        if csv_files:
-            print(f"DataManager: Found processed files: {csv_files}. Starting main app.")
+        if self.store.exists():
+            print("DataManager: Processed data found. Starting main app.")
             return True
         else:
-            print("DataManager: No processed files found. Starting upload screen.")
+            print("DataManager: No processed data found. Starting upload screen.")
             return False
 
     def print_data(self):
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+class DataPager:
+    """
+    Vista paginada sobre el dataframe procesado.
+
+    Solo se serializa a JSON la ventana de filas y las columnas pedidas, de modo que
+    el coste de cada página es proporcional a su tamaño y no se guardan copias del
+    conjunto completo en JSON ni como lista de diccionarios. El orden de filas del
+    último filtro/orden se reutiliza entre páginas consecutivas.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        # (consulta, posiciones) del último filtro/orden; una sola tupla para que las
+        # llamadas del puente, cada una en su hilo, nunca vean una mezcla de dos consultas
+        self._last = (None, None)
+
+    @property
+    def total(self) -> int:
+        return len(self.df)
+
+    def page(self, start: int = 0, size: int = 100, columns=None, team=None,
+             date_from=None, date_to=None, sort_by=None, ascending=True):
+        """
+        Returns:
+            tuple: (JSON string with the page records, number of rows matching the filters)
+        """
+        positions = self._positions(team, date_from, date_to, sort_by, ascending)
+        start = max(int(start), 0)
+        window = positions[start:start + int(size)]
+
+        columns = [c for c in columns if c in self.df.columns] if columns else list(self.df.columns)
+        page_df = self.df.iloc[window][columns]
+        if 'Date' in columns and pd.api.types.is_datetime64_any_dtype(page_df['Date']):
+            # Las fechas se envían como texto, igual que en los ficheros procesados
+            page_df = page_df.assign(Date=page_df['Date'].dt.strftime('%Y-%m-%d'))
+        return page_df.to_json(orient='records'), len(positions)
+
+    def _positions(self, team, date_from, date_to, sort_by, ascending):
+        query = (team, date_from, date_to, sort_by, bool(ascending))
+        last_query, last_positions = self._last
+        if query == last_query:
+            return last_positions
+
+        mask = np.ones(len(self.df), dtype=bool)
+        if team:
+            mask &= ((self.df['HomeTeam'] == team) | (self.df['AwayTeam'] == team)).to_numpy()
+        if date_from:
+            mask &= (self.df['Date'] >= pd.Timestamp(date_from)).to_numpy()
+        if date_to:
+            mask &= (self.df['Date'] <= pd.Timestamp(date_to)).to_numpy()
+        positions = np.flatnonzero(mask)
+
+        if sort_by in self.df.columns:
+            values = self.df[sort_by].iloc[positions].reset_index(drop=True)
+            order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+            positions = positions[order.to_numpy()]
+
+        self._last = (query, positions)
+        return positions
@@ -3,4 +3,7 @@ from .feature_streaks import StreaksCalculator
 from .feature_avg_shots import AvgShotsCalculator
 from .feature_avg_corners import AvgCornersCalculator
 from .feature_points import AvgPointsCalculator
-from .feature_efficiency import EfficiencyCalculator
\ No newline at end of file
+from .feature_efficiency import EfficiencyCalculator
+from .feature_ewm_form import EwmFormCalculator
+from .history import TeamHistory
+from .team_state import TeamState
@@ -1,22 +1,47 @@
 from abc import ABC, abstractmethod
 import pandas as pd
+from .history import TeamHistory
 
 class FeatureCalculator(ABC):
     """
     Clase base abstracta para todos los calculadores de características.
-    Cada calculador debe implementar el método 'calculate'.
+    Cada calculador debe implementar el método 'compute', que devuelve solo el
+    bloque de columnas nuevas; 'calculate' lo añade al dataframe procesado.
     """
-    @abstractmethod
-    def calculate(self, full_df: pd.DataFrame, processed_df: pd.DataFrame, n_matches: int) -> pd.DataFrame:
+    # True si la característica depende de todo el historial y no de los últimos N
+    # partidos: no se calcula por ventanas ni se reparte por bloques entre procesos
+    streaming = False
+
+    def calculate(self, processed_df: pd.DataFrame, n_matches: int, history: TeamHistory = None) -> pd.DataFrame:
         """
         Calcula una nueva característica y la añade al dataframe procesado.
 
         Args:
-            full_df (pd.DataFrame): El dataframe completo con todos los datos originales.
             processed_df (pd.DataFrame): El dataframe que se está construyendo con las nuevas features.
             n_matches (int): El número de partidos previos a considerar.
+            history (TeamHistory, optional): Historial por equipo ya calculado y compartido
+                entre calculadores (y ventanas: puede ser más largo que n_matches).
+                Si no se indica, se construye a partir de processed_df.
 
         Returns:
             pd.DataFrame: El dataframe procesado con la nueva característica añadida.
         """
-        pass
\ No newline at end of file
+        results = self.compute(processed_df, n_matches, history)
+        return pd.concat([processed_df, results], axis=1)
+
+    @abstractmethod
+    def compute(self, processed_df: pd.DataFrame, n_matches: int, history: TeamHistory = None) -> pd.DataFrame:
+        """
+        Calcula las columnas de la característica sin copiar el dataframe procesado.
+
+        Returns:
+            pd.DataFrame: Solo las columnas nuevas, con el mismo índice que processed_df.
+        """
+        pass
+
+    def _get_history(self, processed_df: pd.DataFrame, n_matches: int, history: TeamHistory = None) -> TeamHistory:
+        if history is None:
+            return TeamHistory(processed_df, n_matches)
+        if history.n_matches < n_matches or history.n_rows != len(processed_df):
+            raise ValueError("The shared TeamHistory does not match the dataframe or n_matches.")
+        return history
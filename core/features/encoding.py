@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# Resultado como entero pequeño; -1 si falta
+RESULT_CODES = {'H': 0, 'D': 1, 'A': 2}
+MISSING_RESULT = -1
+
+
+def team_codes(matches: pd.DataFrame):
+    """
+    Local y visitante como ids enteros (int16) sobre un diccionario compartido.
+
+    Si ambas columnas son categóricas con las mismas categorías (como las deja
+    PreProcessor) se usan directamente sus códigos, sin comparar texto.
+
+    Returns:
+        tuple: (ids local, ids visitante, array con el nombre de cada id)
+    """
+    home, away = matches['HomeTeam'], matches['AwayTeam']
+    if isinstance(home.dtype, pd.CategoricalDtype) and isinstance(away.dtype, pd.CategoricalDtype) \
+            and home.cat.categories.equals(away.cat.categories):
+        teams = home.cat.categories.to_numpy(dtype=str)
+        dtype = np.int16 if len(teams) <= np.iinfo(np.int16).max else np.int32
+        return home.cat.codes.to_numpy().astype(dtype), away.cat.codes.to_numpy().astype(dtype), teams
+    codes, teams = pd.factorize(np.concatenate([home.astype(str).to_numpy(), away.astype(str).to_numpy()]))
+    dtype = np.int16 if len(teams) <= np.iinfo(np.int16).max else np.int32
+    codes = codes.astype(dtype)
+    return codes[:len(matches)], codes[len(matches):], np.asarray(teams, dtype=str)
+
+
+def result_codes(ftr: pd.Series) -> np.ndarray:
+    """FTR ('H' / 'D' / 'A') como int8 con RESULT_CODES."""
+    if isinstance(ftr.dtype, pd.CategoricalDtype):
+        lookup = np.array([RESULT_CODES.get(c, MISSING_RESULT) for c in ftr.cat.categories] + [MISSING_RESULT],
+                          dtype=np.int8)
+        # El código -1 de pandas (vacío) cae en el último elemento
+        return lookup[ftr.cat.codes.to_numpy()]
+    return ftr.map(RESULT_CODES).fillna(MISSING_RESULT).to_numpy().astype(np.int8)
+
+
+def day_numbers(dates: pd.Series) -> np.ndarray:
+    """Fechas como días desde 1970-01-01 en int32."""
+    return dates.to_numpy().astype('datetime64[D]').astype(np.int32)
+
+
+def days_to_dates(days) -> np.ndarray:
+    """Inverso de day_numbers."""
+    return np.asarray(days).astype('datetime64[D]')
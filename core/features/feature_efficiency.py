@@ -1,38 +1,24 @@
+import numpy as np
 import pandas as pd
 from .base_calculator import FeatureCalculator
-from .utils import get_historical
 from ..config import EFFICIENCY_COLUMNS
 
 class EfficiencyCalculator(FeatureCalculator):
-    def calculate(self, processed_df: pd.DataFrame, n_matches: int) -> pd.DataFrame:
+    def compute(self, processed_df: pd.DataFrame, n_matches: int, history=None) -> pd.DataFrame:
         print("Process efficiency goals/shots...")
-        results = processed_df.apply(
-            self._calculate_efficiency,
-            axis=1,
-            args=(processed_df, n_matches)
+        history = self._get_history(processed_df, n_matches, history)
+        return pd.DataFrame(
+            self._calculate_efficiency(history, n_matches),
+            index=processed_df.index,
+            columns=EFFICIENCY_COLUMNS
         )
-        results.columns = EFFICIENCY_COLUMNS
-        return pd.concat([processed_df, results], axis=1)
 
-    def _calculate_efficiency(self, row, all_matches, n_matches):
-        home_team = row['HomeTeam']
-        away_team = row['AwayTeam']
-        local_history, away_history = get_historical(row, all_matches, n_matches)
+    def _calculate_efficiency(self, history, n_matches):
+        # Sumas de los últimos N partidos, sin construir la matriz de desfases
+        goals = history.rolling_sum('goals_for', n_matches)
+        shots = history.rolling_sum('shots_for', n_matches)
 
-        # home efficiency
-        l_eff = 0.0
-        if not local_history.empty:
-            goles_local = local_history.apply(lambda x: x['FTHG'] if x['HomeTeam'] == home_team else x['FTAG'], axis=1).sum()
-            remates_local = local_history.apply(lambda x: x['HS'] if x['HomeTeam'] == home_team else x['AS'], axis=1).sum()
-            if remates_local > 0:
-                l_eff = goles_local / remates_local
-
-        # away efficiency
-        v_eff = 0.0
-        if not away_history.empty:
-            goles_visitante = away_history.apply(lambda x: x['FTHG'] if x['HomeTeam'] == away_team else x['FTAG'], axis=1).sum()
-            remates_visitante = away_history.apply(lambda x: x['HS'] if x['HomeTeam'] == away_team else x['AS'], axis=1).sum()
-            if remates_visitante > 0:
-                v_eff = goles_visitante / remates_visitante
-
-        return pd.Series([l_eff, v_eff])
\ No newline at end of file
+        # Goals per shot; 0.0 when there is no history or no shots
+        efficiency = np.zeros_like(goals)
+        np.divide(goals, shots, out=efficiency, where=shots > 0)
+        return efficiency
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from .base_calculator import FeatureCalculator
+from .encoding import RESULT_CODES, team_codes, result_codes, day_numbers
+from ..config import EWM_FORM_COLUMNS, EWM_HALF_LIFE
+
+# Estadísticas de cada equipo, desde su perspectiva (a favor / en contra)
+HOME_STATS = ['FTHG', 'FTAG', 'HS', 'AS', 'HC', 'AC']
+AWAY_STATS = ['FTAG', 'FTHG', 'AS', 'HS', 'AC', 'HC']
+
+
+class EwmFormCalculator(FeatureCalculator):
+    """
+    Medias con decaimiento exponencial de goles, tiros, córners (a favor y en contra)
+    y puntos de cada equipo antes de cada partido.
+
+    Recorre los partidos en orden de fecha y actualiza en O(1) por partido una suma
+    ponderada y un peso por equipo y estadística (media ajustada, como pandas
+    `ewm(halflife=..., adjust=True)`): no guarda ninguna ventana de partidos. La vida
+    media se mide en partidos del propio equipo.
+
+    El estado final (`state`) cabe en unos pocos números por equipo y se guarda con
+    TeamState; al pasarlo de nuevo, solo se aplican los partidos posteriores a su
+    marca de agua, que es lo que usa el procesamiento incremental.
+    """
+
+    # Necesita todo el historial: no se calcula por ventanas ni por bloques
+    streaming = True
+
+    def __init__(self, half_life: float = EWM_HALF_LIFE, state: dict = None):
+        if half_life <= 0:
+            raise ValueError("half_life must be positive.")
+        if state is not None and state.get('half_life') != half_life:
+            raise ValueError("The stored form state was computed with a different half-life.")
+        self.half_life = half_life
+        self.state = state
+
+    def compute(self, processed_df: pd.DataFrame, n_matches: int = None, history=None) -> pd.DataFrame:
+        print("Calculating exponentially weighted form...")
+        decay = 0.5 ** (1 / self.half_life)
+        n_stats = len(HOME_STATS) + 1
+        watermark = pd.Timestamp(self.state['watermark']) if self.state and self.state['watermark'] else None
+
+        home, away, teams = team_codes(processed_df)
+        team_ids = {team: i for i, team in enumerate(teams)}
+        # Equipos del estado guardado que no aparecen en los partidos
+        for team in (self.state['teams'] if self.state else {}):
+            team_ids.setdefault(team, len(team_ids))
+        sums = np.zeros((len(team_ids), n_stats))
+        weights = np.zeros((len(team_ids), n_stats))
+        if self.state:
+            for team, values in self.state['teams'].items():
+                sums[team_ids[team]] = values[:n_stats]
+                weights[team_ids[team]] = values[n_stats:]
+
+        # Una entrada por equipo y partido: local y visitante intercalados, en el orden de los partidos
+        ids = np.column_stack([home, away]).ravel().astype(np.int64)
+        values = self._match_values(processed_df).reshape(-1, n_stats)
+        # Un valor vacío no suma ni da peso, pero el resto sigue decayendo
+        valid = ~np.isnan(values)
+        values = np.where(valid, values, 0.0)
+        days = day_numbers(processed_df['Date'])
+
+        before_sums = np.zeros_like(values)
+        before_weights = np.zeros_like(values)
+        # Las filas hasta la marca de agua ya están incluidas en el estado
+        first = int(np.searchsorted(days, np.datetime64(watermark, 'D').astype(np.int32), side='right')) \
+            if watermark is not None else 0
+        changes = np.flatnonzero(days[first + 1:] != days[first:-1]) + first + 1
+        starts, ends = 2 * np.r_[first, changes], 2 * np.r_[changes, len(days)]
+        repeated = self._days_with_repeated_teams(ids, starts, ends)
+        for day, (start, end) in enumerate(zip(starts, ends)):
+            # Los partidos del mismo día no se ven entre sí: primero se lee y luego se actualiza
+            day_ids = ids[start:end]
+            before_sums[start:end] = sums[day_ids]
+            before_weights[start:end] = weights[day_ids]
+            if not repeated[day]:
+                sums[day_ids] = decay * sums[day_ids] + values[start:end]
+                weights[day_ids] = decay * weights[day_ids] + valid[start:end]
+            else:
+                # Un equipo con dos partidos el mismo día: se aplican en orden
+                for team, value, is_valid in zip(day_ids, values[start:end], valid[start:end]):
+                    sums[team] = decay * sums[team] + value
+                    weights[team] = decay * weights[team] + is_valid
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = (before_sums / before_weights).reshape(len(processed_df), 2 * n_stats)
+        result[:first] = np.nan
+        # Igual que las medias: sin historial de alguno de los dos equipos, la fila queda vacía
+        no_history = np.isnan(result[:, n_stats - 1]) | np.isnan(result[:, -1])
+        result[no_history] = np.nan
+
+        last_date = processed_df['Date'].iloc[-1] if len(processed_df) else None
+        self.state = {
+            'half_life': self.half_life,
+            'watermark': pd.Timestamp(last_date).strftime('%Y-%m-%d') if last_date is not None
+            else (self.state or {}).get('watermark'),
+            'teams': {team: sums[i].tolist() + weights[i].tolist()
+                      for team, i in team_ids.items() if weights[i, -1] > 0}
+        }
+        return pd.DataFrame(result, index=processed_df.index, columns=EWM_FORM_COLUMNS)
+
+    def _match_values(self, processed_df):
+        """Matriz (n_partidos, 2 * n_estadísticas): estadísticas del local y del visitante."""
+        result = result_codes(processed_df['FTR'])
+        home_points = np.select([result == RESULT_CODES['H'], result == RESULT_CODES['D']], [3, 1], 0)
+        away_points = np.select([result == RESULT_CODES['A'], result == RESULT_CODES['D']], [3, 1], 0)
+        return np.column_stack([
+            processed_df[HOME_STATS].to_numpy(dtype=float), home_points,
+            processed_df[AWAY_STATS].to_numpy(dtype=float), away_points
+        ])
+
+    @staticmethod
+    def _days_with_repeated_teams(ids, starts, ends):
+        day = np.repeat(np.arange(len(starts)), ends - starts)
+        entries = ids[starts[0]:ends[-1]] if len(starts) else ids[:0]
+        order = np.lexsort((entries, day))
+        same = (entries[order][1:] == entries[order][:-1]) & (day[order][1:] == day[order][:-1])
+        repeated = np.zeros(len(starts), dtype=bool)
+        repeated[day[order][1:][same]] = True
+        return repeated
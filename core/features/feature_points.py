@@ -1,53 +1,18 @@
+import numpy as np
 import pandas as pd
 from .base_calculator import FeatureCalculator
-from .utils import get_historical
 from ..config import AVG_POINTS_COLUMNS
 class AvgPointsCalculator(FeatureCalculator):
-    def calculate(self, processed_df: pd.DataFrame, n_matches: int) -> pd.DataFrame:
+    def compute(self, processed_df: pd.DataFrame, n_matches: int, history=None) -> pd.DataFrame:
         print("Calculating average points...")
-        
-        results = processed_df.apply(
-            self._calculate_previous_points,
-            axis=1,
-            args=(processed_df, n_matches)
-        )
+        history = self._get_history(processed_df, n_matches, history)
 
-        results.columns = AVG_POINTS_COLUMNS
-        return pd.concat([processed_df, results], axis=1)
+        points = self._calculate_team_score(history, n_matches)
+        # If either team has no historical matches, both values are missing
+        points[(history.counts(n_matches) == 0).any(axis=1)] = np.nan
 
-    def _calculate_previous_points(self, row, all_matches, n_matches):
-        home_team = row['HomeTeam']
-        away_team = row['AwayTeam']
-        
-        # Get historical matches for the local and away teams before the current match Date
-        local_history, away_history = get_historical(row, all_matches, n_matches)
-        
-        if local_history.empty or away_history.empty:
-            return pd.Series([None, None]) 
-        
-        h_points = self._calculate_team_score(local_history, home_team)
-        a_points = self._calculate_team_score(away_history, away_team)
-        
-        return pd.Series([h_points, a_points])
+        return pd.DataFrame(points, index=processed_df.index, columns=AVG_POINTS_COLUMNS)
 
-
-    
-    def _calculate_team_score(self, history, team):
-        if history.empty:
-            return 0 # If there are no historical matches, 0 points
-
-        puntos = 0
-        for _, match in history.iterrows():
-            if match['HomeTeam'] == team: # The team played at home in this past match
-                if match['FTR'] == 'H':
-                    puntos += 3
-                elif match['FTR'] == 'D':
-                    puntos += 1
-                # If FTR == 'A', no points are added
-            elif match['AwayTeam'] == team: # The team played away
-                if match['FTR'] == 'A':
-                    puntos += 3
-                elif match['FTR'] == 'D':
-                    puntos += 1
-                # If FTR == 'H', no points are added
-        return puntos
\ No newline at end of file
+    def _calculate_team_score(self, history, n_matches):
+        # 3 points for a win, 1 for a draw, 0 for a loss (already resolved per team in the history)
+        return history.rolling_sum('points', n_matches)
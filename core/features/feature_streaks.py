@@ -1,55 +1,29 @@
 # core/features/streaks.py
+import numpy as np
 import pandas as pd
 
 from .base_calculator import FeatureCalculator
-from .utils import get_historical
-from ..config import STREAK_COLUMNS
+from ..config import STREAK_KINDS_COLUMNS
 class StreaksCalculator(FeatureCalculator):
-    def calculate(self, processed_df: pd.DataFrame, n_matches: int) -> pd.DataFrame:
+    """
+    Rachas actuales de cada equipo antes del partido, limitadas a los últimos N partidos.
+    Por defecto solo la de victorias; `kinds` añade otras (ver STREAK_KINDS_COLUMNS)
+    sin coste extra por fila.
+    """
+    def __init__(self, kinds=('win',)):
+        unknown = [kind for kind in kinds if kind not in STREAK_KINDS_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown streak kinds {unknown}. Expected any of {list(STREAK_KINDS_COLUMNS)}")
+        self.kinds = list(kinds)
+
+    def compute(self, processed_df: pd.DataFrame, n_matches: int, history=None) -> pd.DataFrame:
         print("Calculating winning streaks...")
-        
-        # Apply function to each row to calculate winning streaks
-        results = processed_df.apply(
-            self._calculate_streaks_wrapper,
-            axis=1,
-            args=(processed_df, n_matches)
-        )
-        results.columns = STREAK_COLUMNS
-        
-        # Merge the results with the current processed DataFrame
-        return pd.concat([processed_df, results], axis=1)
+        history = self._get_history(processed_df, n_matches, history)
 
-    def _calculate_streaks_wrapper(self, row, all_matches, n_matches): # 
-        equipo_local = row['HomeTeam']
-        equipo_visitante = row['AwayTeam']
-        # Get historical matches for the local and away teams before the current match Date
-        local_history, away_history = get_historical(row, all_matches, n_matches)
+        streaks = np.hstack([self._calculate_streak(history, kind, n_matches) for kind in self.kinds])
+        columns = [column for kind in self.kinds for column in STREAK_KINDS_COLUMNS[kind]]
+        return pd.DataFrame(streaks, index=processed_df.index, columns=columns)
 
-        l_win_streak = self._calculate_winning_streak(local_history, equipo_local)
-
-        v_win_streak = self._calculate_winning_streak(away_history, equipo_visitante)
-
-        return pd.Series([l_win_streak, v_win_streak])
-
-    def _calculate_winning_streak(self, historial, team_name):
-        # If the team has no matches in the history, return 0
-        if historial.empty:
-            return 0
-
-        current_streak = 0
-
-        for _, match in historial.iloc[::-1].iterrows():
-
-            # Check if the match is a win for the team
-            won_match = False
-            if (match['HomeTeam'] == team_name and match['FTR'] == 'H') or \
-            (match['AwayTeam'] == team_name and match['FTR'] == 'A'):
-                won_match = True
-
-            if won_match:
-                current_streak += 1
-            else:
-                # If the team did not win, break the streak
-                break
-
-        return current_streak
\ No newline at end of file
+    def _calculate_streak(self, history, kind, n_matches):
+        # Run-length over each team's series; only the last N matches count, as before
+        return np.minimum(history.streaks(kind), n_matches)
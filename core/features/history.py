@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+from .encoding import RESULT_CODES, team_codes, result_codes, day_numbers, days_to_dates
+
+# Condición que mantiene viva cada tipo de racha, evaluada sobre la tabla por equipo
+STREAK_CONDITIONS = {
+    'win': lambda long_df: long_df['win'].to_numpy(),
+    'unbeaten': lambda long_df: long_df['points'].to_numpy() > 0,
+    'losing': lambda long_df: long_df['points'].to_numpy() == 0,
+    'scoring': lambda long_df: long_df['goals_for'].to_numpy() > 0,
+    'clean_sheet': lambda long_df: long_df['goals_against'].to_numpy() == 0,
+}
+
+
+class TeamHistory:
+    """
+    Historial por equipo de todos los partidos, calculado una sola vez.
+
+    Cada partido se convierte en dos filas desde la perspectiva de cada equipo
+    (a favor / en contra). Las filas se ordenan por equipo y fecha, y los
+    agregados de los últimos N partidos de cada equipo estrictamente anteriores a
+    la fecha de cada partido (los que mira `get_historical()`) salen de sumas
+    prefijas sobre esa tabla, sin materializar las ventanas.
+
+    Se espera el dataframe ordenado por fecha, tal y como lo entrega PreProcessor.
+    `n_matches` es la ventana más larga; `counts`, `rolling_sum` y `rolling_count`
+    aceptan ventanas más cortas sin recalcular nada.
+    """
+
+    HOME = 0
+    AWAY = 1
+
+    def __init__(self, matches: pd.DataFrame, n_matches: int):
+        self.n_matches = n_matches
+        self.index = matches.index
+        self.n_rows = len(matches)
+        self._long = self._build_long_table(matches)
+        self._first_in_run, self._team_start = self._build_offsets()
+        self._streaks = {}
+        self._prefix = {}
+        self._sums = {}
+        self._valid_counts = {}
+
+    def _build_long_table(self, matches):
+        n = len(matches)
+        home, away, self.teams = team_codes(matches)
+        result = result_codes(matches['FTR'])
+        day = day_numbers(matches['Date'])
+
+        def both(home_values, away_values):
+            return np.concatenate([np.asarray(home_values), np.asarray(away_values)])
+
+        # Tipos compactos: ids de equipo int16, días int32 y conteos tal cual llegan (int8/int16)
+        long_table = {
+            'match': both(np.arange(n, dtype=np.int32), np.arange(n, dtype=np.int32)),
+            'side': np.repeat(np.array([self.HOME, self.AWAY], dtype=np.int8), n),
+            'team': both(home, away),
+            'day': both(day, day),
+            'goals_for': both(matches['FTHG'], matches['FTAG']),
+            'goals_against': both(matches['FTAG'], matches['FTHG']),
+            'shots_for': both(matches['HS'], matches['AS']),
+            'shots_against': both(matches['AS'], matches['HS']),
+            'corners_for': both(matches['HC'], matches['AC']),
+            'corners_against': both(matches['AC'], matches['HC']),
+            'win': both(result == RESULT_CODES['H'], result == RESULT_CODES['A']),
+            'points': both(
+                np.select([result == RESULT_CODES['H'], result == RESULT_CODES['D']], [3, 1], 0),
+                np.select([result == RESULT_CODES['A'], result == RESULT_CODES['D']], [3, 1], 0)
+            ).astype(np.int8),
+        }
+        # Orden estable por equipo y fecha: dentro de cada equipo se conserva el orden original de los partidos
+        order = np.lexsort((long_table['match'], long_table['day'], long_table['team']))
+        return pd.DataFrame({column: values[order] for column, values in long_table.items()})
+
+    def _build_offsets(self):
+        team = self._long['team'].to_numpy()
+        date = self._long['day'].to_numpy()
+        positions = np.arange(len(team))
+
+        new_team = np.ones(len(team), dtype=bool)
+        new_team[1:] = team[1:] != team[:-1]
+        new_run = new_team.copy()
+        new_run[1:] |= date[1:] != date[:-1]
+
+        # Primera fila del equipo y primera fila del bloque (equipo, fecha) de cada fila
+        team_start = np.maximum.accumulate(np.where(new_team, positions, 0))
+        first_in_run = np.maximum.accumulate(np.where(new_run, positions, 0))
+        return first_in_run, team_start
+
+    def counts(self, window: int = None) -> np.ndarray:
+        """
+        Número de partidos previos disponibles (como máximo `window`, por defecto N)
+        por partido y lado.
+
+        Returns:
+            np.ndarray: matriz (n_partidos, 2) con columnas local / visitante.
+        """
+        window = self._check_window(window)
+        available = np.minimum(self._first_in_run - self._team_start, window)
+        return self._to_match_order(available, fill=0)
+
+    def rolling_sum(self, column: str, window: int = None) -> np.ndarray:
+        """
+        Suma de `column` en los últimos `window` (por defecto N) partidos previos de
+        cada equipo. Los valores vacíos no suman (como `.sum()` de pandas); para una
+        media hay que dividir por `rolling_count`, no por `counts`.
+
+        Se obtiene con sumas prefijas sobre la tabla por equipo: la ventana de cada
+        fila es la diferencia entre dos posiciones del acumulado. El acumulado se
+        calcula una vez por columna, así que cada ventana extra es una resta. Las
+        columnas son conteos enteros, así que el resultado es exacto.
+
+        Returns:
+            np.ndarray: matriz (n_partidos, 2) con columnas local / visitante.
+        """
+        window = self._check_window(window)
+        if (column, window) not in self._sums:
+            if column not in self._prefix:
+                values = self._long[column].to_numpy(dtype=float)
+                valid = ~np.isnan(values)
+                # Acumulado de los valores y de cuántos hay (los vacíos no cuentan)
+                self._prefix[column] = (np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))]),
+                                        np.concatenate([[0], np.cumsum(valid)]))
+            self._sums[column, window] = self._window_total(self._prefix[column][0], window)
+        return self._sums[column, window]
+
+    def rolling_count(self, column: str, window: int = None) -> np.ndarray:
+        """
+        Número de valores no vacíos de `column` en la misma ventana que `rolling_sum`:
+        el denominador de una media que, como `.mean()` de pandas, ignora los vacíos.
+
+        Returns:
+            np.ndarray: matriz (n_partidos, 2) con columnas local / visitante.
+        """
+        window = self._check_window(window)
+        if (column, window) not in self._valid_counts:
+            self.rolling_sum(column, window)
+            self._valid_counts[column, window] = self._window_total(self._prefix[column][1], window)
+        return self._valid_counts[column, window]
+
+    def _window_total(self, prefix, window):
+        end = self._first_in_run
+        start = np.maximum(end - window, self._team_start)
+        return self._to_match_order(prefix[end] - prefix[start], fill=prefix.dtype.type(0))
+
+    def _check_window(self, window):
+        if window is None:
+            return self.n_matches
+        if not 0 < window <= self.n_matches:
+            raise ValueError(f"Window {window} must be between 1 and the history length {self.n_matches}.")
+        return window
+
+    def streaks(self, kind: str) -> np.ndarray:
+        """
+        Racha actual de tipo `kind` (ver STREAK_CONDITIONS) de cada equipo antes de cada partido.
+
+        Se calcula en una pasada sobre la serie de cada equipo: la longitud de la racha
+        que termina en cada fila es su distancia a la última fila que la rompe
+        (acumulado máximo de los reinicios). No se limita a N partidos.
+
+        Returns:
+            np.ndarray: matriz de enteros (n_partidos, 2) con columnas local / visitante.
+        """
+        if kind not in self._streaks:
+            if kind not in STREAK_CONDITIONS:
+                raise ValueError(f"Unknown streak kind '{kind}'. Expected one of {list(STREAK_CONDITIONS)}")
+            holds = STREAK_CONDITIONS[kind](self._long)
+            positions = np.arange(len(holds))
+            # Reinicio en cada fila que rompe la racha; al empezar un equipo se parte de cero
+            resets = np.where(holds, -1, positions)
+            resets = np.where(holds & (positions == self._team_start), positions - 1, resets)
+            run_length = positions - np.maximum.accumulate(resets)
+
+            # La racha previa al partido es la de la última fila de una fecha anterior
+            previous = self._first_in_run - 1
+            has_previous = previous >= self._team_start
+            before = np.zeros(len(holds), dtype=np.int64)
+            before[has_previous] = run_length[previous[has_previous]]
+            self._streaks[kind] = self._to_match_order(before, fill=0)
+        return self._streaks[kind]
+
+    def _to_match_order(self, values, fill):
+        out = np.full((self.n_rows, 2) + values.shape[1:], fill, dtype=values.dtype)
+        out[self._long['match'].to_numpy(), self._long['side'].to_numpy()] = values
+        return out
+
+    def last_matches(self) -> pd.DataFrame:
+        """
+        Últimos N partidos de cada equipo (perspectiva del equipo), en orden cronológico,
+        con el nombre del equipo y la fecha en lugar de sus códigos.
+        """
+        last = self._long.groupby('team', sort=False).tail(self.n_matches)
+        return last.assign(team=self.teams[last['team'].to_numpy()],
+                           Date=days_to_dates(last['day'].to_numpy()))
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from .encoding import team_codes
+
+
+def shard_bounds(dates: pd.Series, n_shards: int):
+    """
+    Splits a date-sorted frame into at most `n_shards` contiguous (start, end) ranges.
+    Boundaries are moved forward to the next date change so matches played on the
+    same day never end up in different shards.
+    """
+    n_rows = len(dates)
+    values = dates.to_numpy()
+    bounds = [0]
+    for target in np.linspace(0, n_rows, n_shards + 1)[1:-1].astype(int):
+        cut = max(target, bounds[-1] + 1)
+        while 0 < cut < n_rows and values[cut] == values[cut - 1]:
+            cut += 1
+        if cut < n_rows and cut > bounds[-1]:
+            bounds.append(cut)
+    bounds.append(n_rows)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def history_positions(matches: pd.DataFrame, start: int, n_matches: int) -> np.ndarray:
+    """
+    Positions before `start` that a shard beginning at `start` needs as history: the
+    last `n_matches` matches of every team, which is all a calculator can look at.
+    """
+    home, away, _ = team_codes(matches.iloc[:start])
+    positions = np.concatenate([np.arange(start), np.arange(start)])
+    teams = pd.Series(np.concatenate([home, away]))
+    order = np.argsort(positions, kind='stable')
+    # Partidos que quedan por delante para ese equipo antes del inicio del bloque
+    remaining = teams.iloc[order].groupby(teams.iloc[order].to_numpy(), sort=False).cumcount(ascending=False)
+    needed = positions[order][remaining.to_numpy() < n_matches]
+    return np.unique(needed)
@@ -0,0 +1,99 @@
+import json
+import os
+import pandas as pd
+
+
+class TeamState:
+    """
+    Estado acumulado de cada equipo: sus últimos N partidos ya procesados.
+
+    Permite calcular las features de partidos nuevos (posteriores a la marca de
+    agua `watermark`) sin recorrer de nuevo todo el historial. El estado se guarda
+    como JSON con cada versión de los datos procesados (ProcessedStore). Las
+    estadísticas vacías se conservan como NaN, igual que en los datos.
+    """
+
+    STATE_COLUMNS = ['Date', 'goals_for', 'goals_against', 'shots_for',
+                     'shots_against', 'corners_for', 'corners_against', 'points']
+    # Rival ficticio para reconstruir los partidos guardados en el estado
+    STATE_OPPONENT = '__state__'
+
+    def __init__(self, n_matches: int, watermark=None, teams=None, form=None):
+        self.n_matches = n_matches
+        self.watermark = pd.Timestamp(watermark) if watermark is not None else None
+        self.teams = teams or {}
+        # Estado de EwmFormCalculator (sumas y pesos por equipo), o None
+        self.form = form
+
+    @classmethod
+    def from_history(cls, history) -> 'TeamState':
+        """Builds the state from a TeamHistory computed over the full processed data."""
+        last = history.last_matches()
+        teams = {}
+        for team, matches in last.groupby('team', sort=False):
+            records = matches[cls.STATE_COLUMNS].copy()
+            records['Date'] = records['Date'].dt.strftime('%Y-%m-%d')
+            teams[team] = records.values.tolist()
+        watermark = last['Date'].max() if not last.empty else None
+        return cls(history.n_matches, watermark, teams)
+
+    def filter_new(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """Returns only the matches strictly after the watermark."""
+        if self.watermark is None:
+            return matches
+        return matches[matches['Date'] > self.watermark]
+
+    def as_matches(self) -> pd.DataFrame:
+        """
+        Rebuilds the stored history as matches against a placeholder opponent, so the
+        regular feature calculators can be reused on them plus the new matches.
+        """
+        rows = []
+        for team, records in self.teams.items():
+            for date, gf, ga, sf, sa, cf, ca, points in records:
+                ftr = 'H' if points == 3 else 'D' if points == 1 else 'A'
+                rows.append({
+                    'Date': pd.Timestamp(date), 'HomeTeam': team, 'AwayTeam': self.STATE_OPPONENT,
+                    'FTHG': gf, 'FTAG': ga, 'FTR': ftr, 'HS': sf, 'AS': sa, 'HC': cf, 'AC': ca
+                })
+        return pd.DataFrame(rows, columns=['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG',
+                                           'FTR', 'HS', 'AS', 'HC', 'AC'])
+
+    def update(self, matches: pd.DataFrame):
+        """Adds already processed matches (sorted by date) to each team's last N."""
+        for row in matches.itertuples(index=False):
+            date = pd.Timestamp(row.Date).strftime('%Y-%m-%d')
+            home_points = 3 if row.FTR == 'H' else 1 if row.FTR == 'D' else 0
+            away_points = 3 if row.FTR == 'A' else 1 if row.FTR == 'D' else 0
+            self._push(row.HomeTeam, [date, row.FTHG, row.FTAG, row.HS, row.AS, row.HC, row.AC, home_points])
+            self._push(row.AwayTeam, [date, row.FTAG, row.FTHG, row.AS, row.HS, row.AC, row.HC, away_points])
+            if self.watermark is None or row.Date > self.watermark:
+                self.watermark = pd.Timestamp(row.Date)
+
+    def _push(self, team, record):
+        records = self.teams.setdefault(team, [])
+        records.append([v if i == 0 or pd.isna(v) else int(v) for i, v in enumerate(record)])
+        del records[:-self.n_matches]
+
+    def to_dict(self) -> dict:
+        return {
+            'n_matches': self.n_matches,
+            'watermark': self.watermark.strftime('%Y-%m-%d') if self.watermark is not None else None,
+            'teams': self.teams,
+            'form': self.form
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'TeamState':
+        return cls(state['n_matches'], state['watermark'], state['teams'], state.get('form'))
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Loads a state saved as a loose JSON file (before it was stored with each
+        processed version), or returns None if there is none.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def get_historical(row, matchs, n_matchs): 
     current_date = row['Date']
     home_team = row['HomeTeam']
@@ -15,4 +18,31 @@ def get_historical(row, matchs, n_matchs):
     away_history = past_matches[ (past_matches['HomeTeam'] == away_team) | (past_matches['AwayTeam'] == away_team)
     ].tail(n_matchs)
 
-    return (local_history, away_history)
\ No newline at end of file
+    return (local_history, away_history)
+
+def window_columns(columns, window):
+    """Column names of a feature block computed over `window` matches (other than N)."""
+    return [f'{column}_w{window}' for column in columns]
+
+
+def average_for_against(history, stat, window=None):
+    """
+    Media de `stat` a favor y en contra en los últimos `window` partidos de cada equipo
+    (por defecto la longitud del historial).
+
+    Los valores vacíos no cuentan ni en la suma ni en el número de partidos, igual
+    que `.mean()` de pandas; si todos lo están, la media es NaN.
+
+    Returns:
+        np.ndarray: matriz (n_partidos, 4) con el orden
+        [local a favor, local en contra, visitante a favor, visitante en contra].
+        Si alguno de los dos equipos no tiene historial, la fila completa es NaN.
+    """
+    counts = history.counts(window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_for = history.rolling_sum(f'{stat}_for', window) / history.rolling_count(f'{stat}_for', window)
+        avg_against = history.rolling_sum(f'{stat}_against', window) / history.rolling_count(f'{stat}_against', window)
+
+    block = np.column_stack([avg_for[:, 0], avg_against[:, 0], avg_for[:, 1], avg_against[:, 1]])
+    block[(counts == 0).any(axis=1)] = np.nan
+    return block
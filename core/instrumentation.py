@@ -0,0 +1,182 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from .config import INSTRUMENT_MEMORY, STAGE_LOG_MAX_BYTES, STAGE_HISTORY
+
+# Solo librería estándar: se importa desde app.api al arrancar
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'logs', 'stages.jsonl')
+
+
+class StageRecord:
+    """Medidas de una etapa en curso. `rows` lo puede fijar quien ejecuta la etapa."""
+
+    def __init__(self, name, rows=None, parent=None):
+        self.name = name
+        self.rows = rows
+        self.parent = parent
+        self.peak = 0
+
+    def to_dict(self, started_at, seconds, allocated, peak, error):
+        return {
+            'stage': self.name,
+            'parent': self.parent,
+            'started_at': started_at,
+            'seconds': seconds,
+            'rows': self.rows,
+            'rows_per_s': self.rows / seconds if self.rows and seconds > 0 else None,
+            'allocated_bytes': allocated,
+            'peak_bytes': peak,
+            'thread': threading.current_thread().name,
+            'status': 'error' if error else 'ok',
+            'error': error
+        }
+
+
+class StageRecorder:
+    """
+    Registra tiempo de reloj, filas y memoria (tracemalloc) de cada etapa.
+
+    Cada etapa terminada se añade como una línea JSON al log y a una cola en
+    memoria con las últimas `history` etapas, que es lo que consulta la API.
+    `allocated_bytes` es la memoria trazada que la etapa deja reservada al
+    terminar y `peak_bytes` el pico alcanzado por encima de la del inicio;
+    con etapas en paralelo el pico es el del proceso completo. Si la traza la
+    inicia el registro, se detiene al cerrarse la última etapa abierta.
+    """
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, trace_memory=INSTRUMENT_MEMORY,
+                 history=STAGE_HISTORY, max_log_bytes=STAGE_LOG_MAX_BYTES):
+        self.log_path = log_path
+        self.trace_memory = trace_memory
+        self.max_log_bytes = max_log_bytes
+        self._records = deque(maxlen=history)
+        self._open = []
+        # True si tracemalloc lo arrancó este registro (y no, p. ej., los benchmarks)
+        self._owns_trace = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        stack = self._stack()
+        record = StageRecord(name, rows, stack[-1].name if stack else None)
+        started_at = datetime.now().isoformat(timespec='milliseconds')
+        start_memory = self._start_tracing(record)
+        stack.append(record)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield record
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            allocated, peak = self._stop_tracing(record, start_memory)
+            self._emit(record.to_dict(started_at, seconds, allocated, peak, error))
+
+    def instrumented(self, name=None, rows=None):
+        """
+        Decorator version of stage(). `rows`, if given, is called with the same
+        arguments as the function once it returns and gives the rows processed.
+        """
+        def decorator(fn):
+            stage_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name) as record:
+                    result = fn(*args, **kwargs)
+                    if rows is not None:
+                        record.rows = rows(*args, **kwargs)
+                    return result
+            return wrapper
+        return decorator
+
+    def recent(self, limit=None, stage=None):
+        """Most recent stage records, newest last."""
+        with self._lock:
+            records = [r for r in self._records if stage is None or r['stage'] == stage]
+        return records[-limit:] if limit else records
+
+    def summary(self):
+        """Per-stage aggregates of the records kept in memory."""
+        summary = {}
+        for r in self.recent():
+            s = summary.setdefault(r['stage'], {'count': 0, 'errors': 0, 'total_seconds': 0.0,
+                                                'max_seconds': 0.0, 'max_peak_bytes': None})
+            s['count'] += 1
+            s['errors'] += r['status'] == 'error'
+            s['total_seconds'] += r['seconds']
+            s['max_seconds'] = max(s['max_seconds'], r['seconds'])
+            s['last_seconds'] = r['seconds']
+            s['last_rows'] = r['rows']
+            if r['peak_bytes'] is not None:
+                s['max_peak_bytes'] = max(s['max_peak_bytes'] or 0, r['peak_bytes'])
+        for s in summary.values():
+            s['mean_seconds'] = s['total_seconds'] / s['count']
+        return summary
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _start_tracing(self, record):
+        if not self.trace_memory:
+            return None
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_trace = True
+            # El pico se reinicia en cada etapa; antes se traslada a las etapas abiertas
+            self._fold_peak()
+            self._open.append(record)
+            return tracemalloc.get_traced_memory()[0]
+
+    def _stop_tracing(self, record, start_memory):
+        if start_memory is None:
+            return None, None
+        with self._lock:
+            self._fold_peak()
+            self._open.remove(record)
+            current = tracemalloc.get_traced_memory()[0]
+            if not self._open and self._owns_trace:
+                tracemalloc.stop()
+                self._owns_trace = False
+        return current - start_memory, max(record.peak - start_memory, 0)
+
+    def _fold_peak(self):
+        _, peak = tracemalloc.get_traced_memory()
+        for record in self._open:
+            record.peak = max(record.peak, peak)
+        tracemalloc.reset_peak()
+
+    def _emit(self, entry):
+        with self._lock:
+            self._records.append(entry)
+            if self.log_path is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > self.max_log_bytes:
+                    os.replace(self.log_path, self.log_path + '.1')
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except OSError as e:
+                print(f"Could not write stage log: {e}")
+
+
+# Instancia compartida por DataManager, PreProcessor, el modelo y la API
+recorder = StageRecorder()
+stage = recorder.stage
+instrumented = recorder.instrumented
@@ -1,20 +1,28 @@
-from .models.multiple_linear_regression import MultipleLinearRegressionModel
+# Registro con los modelos de la app, cargados por nombre (ver core/models/registry.py)
+registry = None
 
-print("MODEL_TRAINER: Initializing and loading the global prediction model...")
 
-# Esta variable contendrá la única instancia del modelo para toda la app.
-model_instance = None
+def get_model(model_id=None):
+    """The loaded model called `model_id` (the default model if None), or None."""
+    return registry.get(model_id) if registry is not None else None
 
-try:
-    # Creamos la instancia del modelo
-    model_instance = MultipleLinearRegressionModel()
-    
-    # Cargamos los modelos y los datos de prueba que ya existen en disco
-    model_instance.load_models()
-    model_instance.load_test_data()
-    
-    print("MODEL_TRAINER: Global model instance created and loaded successfully.")
-except Exception as e:
-    print(f"MODEL_TRAINER: FAILED to load global model. Error: {e}")
-    # Dejamos la variable como None si algo falla para poder manejar el error
-    model_instance = None
\ No newline at end of file
+
+def load():
+    """
+    Loads the prediction models from disk. Called from the background startup
+    thread instead of at import time, so the window can open first.
+    """
+    global registry
+    from .models.registry import ModelRegistry
+
+    print("MODEL_TRAINER: Initializing and loading the prediction models...")
+    try:
+        # Cargamos los modelos y los datos de prueba que ya existen en disco
+        instance = ModelRegistry().load()
+
+        registry = instance
+        print(f"MODEL_TRAINER: Models loaded: {', '.join(instance.models) or 'none'}.")
+    except Exception as e:
+        print(f"MODEL_TRAINER: FAILED to load the models. Error: {e}")
+        # Dejamos la variable como None si algo falla para poder manejar el error
+        registry = None
@@ -1,25 +1,284 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+import os
+import numpy as np
 import pandas as pd
+from ..config import FEATURES_COLUMNS, HOME_TARGET, AWAY_TARGET, MODEL_RETENTION
+from ..instrumentation import stage
+from ..store import ModelStore
+from .feature_matrix import FeatureMatrix
+from .score_matrix import ScoreMatrixEngine
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'data', 'models')
+# Partición de prueba de las versiones anteriores al manifiesto de modelos
+LEGACY_TEST_PATH = os.path.join(PROJECT_ROOT, 'data', 'test', 'multiple_linear_regression_test.csv')
+
 
 class BaseModel(ABC):
     """
     Clase base abstracta para todas las implementaciones de modelos.
+
+    Cada modelo predice los goles de local y visitante. La partición de prueba, su
+    índice de partidos y las predicciones (una o en lote) son comunes; cada modelo
+    solo implementa cómo se ajusta, se guarda, se carga y puntúa filas de features.
+
+    Los modelos local y visitante se guardan juntos en un solo artefacto, dentro de
+    una versión de ModelStore (ver ModelRegistry.save); load_models() carga el de la
+    versión actual del manifiesto.
     """
+
+    # Nombre con el que se registra y se carga el modelo (ver registry.py)
+    name = None
+
     def __init__(self):
         self.model_home = None
         self.model_away = None
+        self.feature_order = list(FEATURES_COLUMNS)
+        # MAE/RMSE de los folds walk-forward, si el modelo los calcula
+        self.cv_report = None
+
+        # Test
+        self.df_test = None
+        # Índice (HomeTeam, AwayTeam, 'dd/mm/yy') -> fila de las matrices de prueba
+        self.fixture_index = {}
+        self.test_features = None
+        self.test_targets = None
+
+        # paths
+        self.models_dir = MODELS_DIR
+        self.store = ModelStore(self.models_dir, MODEL_RETENTION)
+        # Artefacto y partición de prueba cargados (los de la versión actual del manifiesto)
+        self.model_path = None
+        self.test_path = None
 
-    @abstractmethod
     def train(self, data: pd.DataFrame):
         """
         Entrena los modelos para goles de local y visitante.
-        Debe devolver un diccionario con las métricas de evaluación.
+        Devuelve un diccionario con las métricas de evaluación (o None).
+        """
+        with stage(f'{type(self).__name__}.train', rows=len(data)):
+            return self.fit(FeatureMatrix(data))
+
+    @abstractmethod
+    def fit(self, matrix: FeatureMatrix):
+        """
+        Entrena con las filas de entrenamiento de una FeatureMatrix compartida, sin
+        copiarla, y toma su partición de prueba. Devuelve las métricas o None.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, directory: str) -> str:
+        """
+        Guarda los modelos local y visitante en un artefacto dentro de `directory`
+        y devuelve el nombre del fichero.
+        """
+        pass
+
+    @abstractmethod
+    def load(self, path: str):
+        """
+        Carga los modelos desde un artefacto escrito por save().
         """
         pass
 
+    def load_models(self):
+        """
+        Carga los modelos de la versión actual del manifiesto: leer el manifiesto y un
+        fichero, sin listar data/models. Sin manifiesto se usa _load_legacy().
+        """
+        entry = self.store.current()
+        if entry is None or self.name not in entry.get('models', {}):
+            self._load_legacy()
+            return
+        self.load_from_entry(entry)
+
+    def load_from_entry(self, entry: dict):
+        """Loads this model and the test split path from a ModelStore version entry."""
+        print(f"Loading {self.name} models from version {entry['version']}")
+        try:
+            self.load(self.store.path(entry['version'], entry['models'][self.name]['file']))
+            self.test_path = self.store.path(entry['version'], entry['test'])
+        except Exception as e:
+            print(f"An error occurred while loading models: {e}")
+            self.model_home = None
+            self.model_away = None
+            self._clear()
+
+    def _load_legacy(self):
+        print(f"Error: No {self.name} model found in {self.models_dir}.")
+
+    def _clear(self):
+        """Forgets a partially loaded model."""
+        pass
+
     @abstractmethod
-    def save(self, home_path: str, away_path: str):
+    def is_trained(self) -> bool:
+        pass
+
+    @abstractmethod
+    def _predict_rows(self, features: np.ndarray) -> np.ndarray:
+        """(k, n_features) -> (k, 2): goles de local y visitante."""
+        pass
+
+    def save_test_data(self, path: str):
+        self.df_test.to_csv(path, index=False)
+        print(f"Test data saved to {path}")
+
+    def load_test_data(self):
+        if self.test_path is None:
+            # Modelos cargados de ficheros anteriores al manifiesto
+            self.test_path = LEGACY_TEST_PATH
+        df_test = pd.read_csv(self.test_path)
+        df_test['Date'] = pd.to_datetime(df_test['Date'])
+        self.df_test = df_test
+        self._build_fixture_index()
+        print(f"Test data loaded successfully from {self.test_path}. Number of records: {len(self.df_test)}")
+
+    def test_metrics(self):
+        """MAE and RMSE of home and away goals on the test split."""
+        if not self.is_trained() or self.test_features is None or not len(self.test_features):
+            return None
+        errors = self._predict_rows(self.test_features) - self.test_targets
+        mae = np.abs(errors).mean(axis=0)
+        rmse = np.sqrt((errors ** 2).mean(axis=0))
+        return {'test_rows': len(errors),
+                'home_mae': float(mae[0]), 'home_rmse': float(rmse[0]),
+                'away_mae': float(mae[1]), 'away_rmse': float(rmse[1])}
+
+    def predict(self, home_team: str, away_team: str, date: str):
+        """
+        Returns:
+            tuple: (pred_h, pred_a, real_h, real_a) | (None, None, None, None)
+        """
+        if not self.is_trained():
+            print("Error: Los modelos no están cargados. Ejecuta train_model() primero.")
+            return None, None, None, None
+
+        if self.df_test is None:
+            print("Error: El dataset de prueba (df_test) no está cargado. Ejecuta load_test_data() primero.")
+            return None, None, None, None
+
+        row = self._find_fixture(home_team, away_team, date)
+        if row is None:
+            print(f"Error: No se encontró el partido {home_team} vs {away_team} en la fecha {date} en el dataset de prueba.")
+            return None, None, None, None
+
+        pred_h, pred_a = self._predict_rows(self.test_features[row:row + 1])[0]
+
+        real_h, real_a = self.test_targets[row]
+
+        print(f"Predicción para {home_team} vs {away_team}: {pred_h:.2f} - {pred_a:.2f}")
+        print(f"Resultado real: {real_h} - {real_a}")
+
+        return pred_h, pred_a, real_h, real_a
+
+    def predict_batch(self, fixtures=None, outcomes=False):
         """
-        Guarda los modelos entrenados en disco.
+        Scores many fixtures at once with a single call to the model.
+
+        Args:
+            fixtures: DataFrame with HomeTeam/AwayTeam/Date columns, or a list of
+                (home, away, date) tuples or dicts with home_team/away_team/date keys.
+                Dates use the 'dd/mm/yy' format. If None, the whole test split is scored.
+            outcomes: also add the outcome probabilities of ScoreMatrixEngine
+                (p_home_win, p_draw, p_away_win, p_over_2_5, ..., p_btts) and the
+                most likely score, taking the predicted goals as Poisson rates.
+
+        Returns:
+            dict: columnar payload (one list per field). Fixtures not found in the test
+            split have found=False and None in the goal fields.
         """
-        pass
\ No newline at end of file
+        if not self.is_trained() or self.df_test is None:
+            print("Error: Los modelos o el dataset de prueba no están cargados.")
+            return None
+
+        n_fixtures = len(fixtures) if fixtures is not None else len(self.fixture_index)
+        with stage(f'{type(self).__name__}.predict_batch', rows=n_fixtures):
+            if fixtures is None:
+                rows = np.arange(len(self.df_test))
+                homes = self.df_test['HomeTeam'].astype(str).tolist()
+                aways = self.df_test['AwayTeam'].astype(str).tolist()
+                dates = self.df_test['Date'].dt.strftime('%d/%m/%y').tolist()
+            else:
+                homes, aways, dates = self._unpack_fixtures(fixtures)
+                rows = np.array([self._find_fixture(h, a, d) for h, a, d in zip(homes, aways, dates)], dtype=float)
+                rows = np.where(np.isnan(rows), -1, rows).astype(int)
+
+            found = rows >= 0
+            # sklearn no admite predecir cero filas: sin partidos encontrados no se llama al modelo
+            predictions = self._predict_rows(self.test_features[rows[found]]) if found.any() \
+                else np.empty((0, 2))
+            targets = self.test_targets[rows[found]]
+
+            predicted = np.full((len(rows), 2), np.nan)
+            actual = np.full((len(rows), 2), np.nan)
+            predicted[found] = predictions
+            actual[found] = targets
+
+            def to_list(values, cast):
+                return [cast(v) if ok else None for v, ok in zip(values, found)]
+
+            result = {
+                'home_team': list(homes),
+                'away_team': list(aways),
+                'date': list(dates),
+                'found': found.tolist(),
+                'predicted_home_goals': to_list(predicted[:, 0], float),
+                'predicted_away_goals': to_list(predicted[:, 1], float),
+                'actual_home_goals': to_list(actual[:, 0], int),
+                'actual_away_goals': to_list(actual[:, 1], int),
+            }
+            if outcomes:
+                probabilities = ScoreMatrixEngine().probabilities(predictions[:, 0], predictions[:, 1])
+                for market, values in probabilities.items():
+                    column = np.zeros(len(rows), dtype=values.dtype)
+                    column[found] = values
+                    if market.startswith('likely_'):
+                        result[market] = to_list(column, int)
+                    else:
+                        result[f'p_{market}'] = to_list(column, float)
+            return result
+
+    def _unpack_fixtures(self, fixtures):
+        if isinstance(fixtures, pd.DataFrame):
+            dates = fixtures['Date']
+            if pd.api.types.is_datetime64_any_dtype(dates):
+                dates = dates.dt.strftime('%d/%m/%y')
+            return fixtures['HomeTeam'].tolist(), fixtures['AwayTeam'].tolist(), dates.tolist()
+
+        homes, aways, dates = [], [], []
+        for fixture in fixtures:
+            if isinstance(fixture, dict):
+                fixture = (fixture.get('home_team'), fixture.get('away_team'), fixture.get('date'))
+            home, away, date = fixture
+            homes.append(home)
+            aways.append(away)
+            dates.append(date)
+        return homes, aways, dates
+
+    def _build_fixture_index(self):
+        """
+        Indexes the test split once: features and targets as contiguous arrays and a
+        dict from (HomeTeam, AwayTeam, 'dd/mm/yy') to their row, so a lookup is O(1).
+        """
+        self.test_features = np.ascontiguousarray(self.df_test[self.feature_order].to_numpy(dtype=np.float64))
+        self.test_targets = self.df_test[[HOME_TARGET, AWAY_TARGET]].to_numpy()
+        dates = self.df_test['Date'].dt.strftime('%d/%m/%y')
+        self.fixture_index = {}
+        for row, key in enumerate(zip(self.df_test['HomeTeam'], self.df_test['AwayTeam'], dates)):
+            # Como la máscara anterior, ante duplicados se usa la primera fila
+            self.fixture_index.setdefault(key, row)
+
+    def _find_fixture(self, home_team, away_team, date):
+        row = self.fixture_index.get((home_team, away_team, date))
+        if row is None:
+            # Fechas sin ceros a la izquierda (p. ej. 1/9/24): se normalizan solo en este caso
+            try:
+                normalized = datetime.strptime(date, '%d/%m/%y').strftime('%d/%m/%y')
+            except (TypeError, ValueError) as e:
+                print(f"Error al buscar el partido en el dataset de prueba: {e}")
+                return None
+            row = self.fixture_index.get((home_team, away_team, normalized))
+        return row
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from ..config import FEATURES_COLUMNS, N_SPLITS, HOME_TARGET, AWAY_TARGET
+
+
+class FeatureMatrix:
+    """
+    Matriz de features compartida por todos los modelos: se construye una vez por
+    entrenamiento (float32, contigua) y cada modelo recibe vistas de ella, nunca copias.
+
+    Las filas con algún valor vacío se descartan, como hacía el modelo lineal. Los
+    folds son los de un TimeSeriesSplit: cada uno entrena con [0, inicio) y evalúa en
+    [inicio, fin); el último es la partición de prueba.
+    """
+
+    def __init__(self, df: pd.DataFrame, features=None, n_splits: int = N_SPLITS):
+        from sklearn.model_selection import TimeSeriesSplit
+
+        self.df = df.dropna()
+        self.features = list(features or FEATURES_COLUMNS)
+        self.X = np.ascontiguousarray(self.df[self.features].to_numpy(dtype=np.float32))
+        self.Y = self.df[[HOME_TARGET, AWAY_TARGET]].to_numpy(dtype=np.float64)
+        self.folds = [(int(test_index[0]), int(test_index[-1]) + 1)
+                      for _, test_index in TimeSeriesSplit(n_splits=n_splits).split(self.X)]
+        self.train_rows, self.test_end = self.folds[-1]
+        self.df_test = self.df.iloc[self.train_rows:self.test_end].copy()
+
+    def __len__(self):
+        return len(self.X)
+
+    @property
+    def X_train(self):
+        return self.X[:self.train_rows]
+
+    @property
+    def Y_train(self):
+        return self.Y[:self.train_rows]
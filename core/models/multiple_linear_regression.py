@@ -1,174 +1,241 @@
-from datetime import datetime
+import json
 import os
-import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import TimeSeriesSplit
-import joblib
-from ..config import FEATURES_COLUMNS, N_SPLITS, HOME_TARGET, AWAY_TARGET
+from ..config import FEATURES_COLUMNS, MODEL_FORGETTING, RIDGE_ALPHA
 from .base_model import BaseModel
+from .feature_matrix import FeatureMatrix
+from .normal_equations import NormalEquations
 
 class MultipleLinearRegressionModel(BaseModel):
-    def __init__(self):
+    """
+    Regresión lineal de goles de local y visitante, resuelta con las ecuaciones
+    normales (XᵀX, Xᵀy) acumuladas sobre la matriz compartida. Predecir es un
+    producto con los coeficientes; sklearn no hace falta ni para entrenar.
+    """
+
+    name = 'linear'
+    # Prefijo de los artefactos sueltos en data/models de antes del manifiesto
+    artifact_prefix = 'linear_coefficients_'
+    # Penalización ridge de los coeficientes (0 = mínimos cuadrados)
+    alpha = 0.0
+
+    def __init__(self, forgetting: float = MODEL_FORGETTING):
         super().__init__()
         self.df = None
+        # Coeficientes nativos: fila 0 local, fila 1 visitante; columna 0 = intercepto
+        self.coefficients = None
+        # XᵀX, Xᵀy y filas del conjunto de entrenamiento, para update() sin reentrenar;
+        # statistics_last_match es (fecha, local, visitante) de su última fila
+        self.forgetting = forgetting
+        self.statistics = None
+        self.statistics_last_match = None
+
+    def fit(self, matrix: FeatureMatrix, evaluate: bool = True):
+        """
+        Fits the home and away models on every fold but the last one of the
+        matrix; the last fold is kept as the test split.
+
+        With `evaluate` every walk-forward fold is also scored (see cv_report).
+        The sufficient statistics of the training rows are kept for update().
+
+        Returns:
+            dict | None: the walk-forward report, or None if `evaluate` is False.
+        """
+        self.df = matrix.df
+        self.feature_order = list(matrix.features)
+        self.df_test = matrix.df_test
+        self._build_fixture_index()
+
+        # Con olvido, el partido más reciente pesa 1 y cada anterior `forgetting` veces menos
+        self.statistics = NormalEquations(len(self.feature_order), 2, self.forgetting)
+        self.cv_report = self._walk_forward_report(matrix, self.statistics) if evaluate else None
+        # Sin informe, las filas de entrenamiento se añaden de una vez
+        n_rows = self.statistics.n_rows
+        self.statistics.add(matrix.X[n_rows:matrix.train_rows], matrix.Y[n_rows:matrix.train_rows])
+        self.coefficients = self.statistics.solve(self.alpha)
+        self.statistics_last_match = self._last_trained_match()
+        return self.cv_report
+
+    def update(self, data) -> bool:
+        """
+        Refits the models on `data` without revisiting the rows already trained on:
+        the rows between the stored statistics and the new test split are folded in
+        with a rank-k update and the coefficients are re-solved. The test split
+        becomes the last fold of `data`, as in train(). cv_report is cleared: its
+        folds were scored on the previous training rows.
 
-        self.X = None
-        self.y_home = None
-        self.y_away = None
-        # Train
-        self.X_train_final = None
-        self.y_home_train_final = None
-        self.y_away_train_final = None
-
-        # Test
-        self.df_test = None
-        # self.X_test_final = None
-        # self.y_home_test_final = None
-        # self.y_away_test_final = None
-
-        self.test_index = None
-        # idk this variable
-        # self.info_test_final = None
-
-        # paths
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-        self.models_dir = os.path.join(project_root, 'data', 'models')
-        self.test_dir = os.path.join(project_root, 'data', 'test')
-
-        os.makedirs(self.models_dir, exist_ok=True)
-        os.makedirs(self.test_dir, exist_ok=True)
-        # models 
+        Args:
+            data: the processed history (DataFrame or FeatureMatrix), the trained
+                rows followed by the new matches.
+
+        Returns:
+            bool: False if `data` does not extend the trained rows (no statistics,
+            rows changed, different features or forgetting); call train() then.
+        """
+        if self.statistics is None or self.feature_order != list(FEATURES_COLUMNS) \
+                or self.statistics.forgetting != self.forgetting:
+            return False
+        matrix = data if isinstance(data, FeatureMatrix) else FeatureMatrix(data)
+        n_trained = self.statistics.n_rows
+        if n_trained == 0 or matrix.train_rows < n_trained or \
+                self._last_trained_match(matrix.df) != self.statistics_last_match:
+            return False
+
+        self.df = matrix.df
+        self.statistics.add(matrix.X[n_trained:matrix.train_rows], matrix.Y[n_trained:matrix.train_rows])
+        self.coefficients = self.statistics.solve(self.alpha)
+        self.statistics_last_match = self._last_trained_match()
+        # El informe walk-forward describe otro conjunto de entrenamiento: no se guarda con esta versión
+        self.cv_report = None
+        # Los modelos de sklearn (artefactos antiguos) ya no corresponden a los coeficientes
         self.model_home = None
         self.model_away = None
 
-        # models paths
-        date = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        self.home_model_path = os.path.join(self.models_dir, f'home_model_{date}.pkl')
-        self.away_model_path = os.path.join(self.models_dir, f'away_model_{date}.pkl')
-
-        self.test_path = os.path.join(self.test_dir, 'multiple_linear_regression_test.csv')
-
-    def train(self, df: pd.DataFrame):
-        self.df = df
-        self.df = self.df.dropna()
-        self.X = self.df[FEATURES_COLUMNS]
-        self.y_home = self.df[HOME_TARGET]
-        self.y_away = self.df[AWAY_TARGET]
-
-        tscv_final = TimeSeriesSplit(n_splits=N_SPLITS)
-        # Get the last train/test split directly
-        train_index, self.test_index = list(tscv_final.split(self.X))[-1]
-        
-        # --- KEY CHANGE ---
-        # After splitting, immediately assign the test dataframe to the instance attribute.
-        # We use .copy() to prevent potential warnings from pandas later.
-        self.df_test = self.df.iloc[self.test_index].copy()
-        
-        # Training
-        self.X_train_final = self.X.iloc[train_index]
-        self.y_home_train_final = self.y_home.iloc[train_index]
-        self.y_away_train_final = self.y_away.iloc[train_index]
-        # Testing
-        # self.X_test_final = self.X.iloc[test_index]
-        # self.y_home_test_final = self.y_home.iloc[test_index]
-        # self.y_away_test_final = self.y_away.iloc[test_index]
-
-        # self.info_test_final = self.df.iloc[test_index]
-        self.model_home = LinearRegression().fit(self.X_train_final, self.y_home_train_final)
-        self.model_away = LinearRegression().fit(self.X_train_final, self.y_away_train_final)
-
-
-    def save(self):
-        print(f"Saving models to {self.home_model_path} and {self.away_model_path}")
-        if self.model_home:
-            joblib.dump(self.model_home, self.home_model_path)
-        if self.model_away:
-            joblib.dump(self.model_away, self.away_model_path)
-        
-        # --- KEY CHANGE ---
-        # Now we save the dataframe that is already an attribute of the class.
-        if self.df_test is not None:
-            self.df_test.to_csv(self.test_path, index=False)
-            print("Models saved successfully.")
-            print(f"Test data saved to {self.test_path}")
-        else:
-            print("Models saved, but test data was not available to save.")
-    
-    def load_models(self):
-        print(f"Searching for latest models in {self.models_dir}")
-        
-        try:
-            home_models = [f for f in os.listdir(self.models_dir) if f.startswith('home_model_') and f.endswith('.pkl')]
-            away_models = [f for f in os.listdir(self.models_dir) if f.startswith('away_model_') and f.endswith('.pkl')]
-
-            if not home_models or not away_models:
-                print("Error: No model files found in the directory.")
-                self.model_home = None
-                self.model_away = None
-                return
+        self.df_test = matrix.df_test
+        self._build_fixture_index()
+        print(f"Model updated with {matrix.train_rows - n_trained} new matches ({self.statistics.n_rows} in total).")
+        return True
 
-            latest_home_model_file = max(home_models, key=lambda f: os.path.getmtime(os.path.join(self.models_dir, f)))
-            latest_away_model_file = max(away_models, key=lambda f: os.path.getmtime(os.path.join(self.models_dir, f)))
+    def is_trained(self):
+        return self.coefficients is not None
 
-            self.home_model_path = os.path.join(self.models_dir, latest_home_model_file)
-            self.away_model_path = os.path.join(self.models_dir, latest_away_model_file)
+    def _last_trained_match(self, df=None):
+        df = self.df if df is None else df
+        n_rows = self.statistics.n_rows
+        if not n_rows:
+            return None
+        row = df.iloc[n_rows - 1]
+        return row['Date'].strftime('%Y-%m-%d'), str(row['HomeTeam']), str(row['AwayTeam'])
 
-            print(f"Loading models from {self.home_model_path} and {self.away_model_path}")
-            self.model_home = joblib.load(self.home_model_path)
-            self.model_away = joblib.load(self.away_model_path)
-            print("Models loaded successfully.")
-        except Exception as e:
-            print(f"An error occurred while loading models: {e}")
-            self.model_home = None
-            self.model_away = None
-    
-    def load_test_data(self):
-        df_test = pd.read_csv(self.test_path)
-        df_test['Date'] = pd.to_datetime(df_test['Date'])
-        self.df_test = df_test
-        print(f"Test data loaded successfully from {self.test_path}. Number of records: {len(self.df_test)}")
-
-    def predict(self, home_team: str, away_team: str, date: str):
+    def _walk_forward_report(self, matrix, equations):
         """
-        Returns:
-            tuple: (pred_h, pred_a, real_h, real_a) | (None, None, None, None)
+        MAE and RMSE of home and away goals on every walk-forward fold. The normal
+        equations grow with each fold's new training rows instead of refitting.
+        """
+        report = []
+        for fold, (start, end) in enumerate(matrix.folds, start=1):
+            equations.add(matrix.X[equations.n_rows:start], matrix.Y[equations.n_rows:start])
+            coefficients = equations.solve(self.alpha)
+            errors = NormalEquations.design(matrix.X[start:end]) @ coefficients.T - matrix.Y[start:end]
+            mae = np.abs(errors).mean(axis=0)
+            rmse = np.sqrt((errors ** 2).mean(axis=0))
+            report.append({
+                'fold': fold, 'train_rows': int(start), 'test_rows': int(end - start),
+                'home_mae': float(mae[0]), 'home_rmse': float(rmse[0]),
+                'away_mae': float(mae[1]), 'away_rmse': float(rmse[1])
+            })
+
+        metrics = ['home_mae', 'home_rmse', 'away_mae', 'away_rmse']
+        mean = {metric: float(np.mean([fold[metric] for fold in report])) for metric in metrics}
+        print(f"Walk-forward CV of {self.name} ({len(report)} folds): "
+              f"home MAE {mean['home_mae']:.3f} RMSE {mean['home_rmse']:.3f}, "
+              f"away MAE {mean['away_mae']:.3f} RMSE {mean['away_rmse']:.3f}")
+        return {'n_splits': len(report), 'train_rows': int(matrix.train_rows), 'folds': report, 'mean': mean}
+
+    def save(self, directory: str) -> str:
+        # El informe de validación (texto JSON) y los estadísticos viajan en el mismo artefacto
+        extra = {}
+        if self.cv_report is not None:
+            extra['report'] = np.array(json.dumps(self.cv_report))
+        if self.statistics is not None:
+            extra.update(self.statistics.to_arrays())
+            extra['last_match'] = np.array(self.statistics_last_match or ('', '', ''), dtype=str)
+        file_name = f'{self.name}.npz'
+        np.savez(os.path.join(directory, file_name), coefficients=self.coefficients,
+                 features=np.array(self.feature_order, dtype=str), **extra)
+        return file_name
+
+    def _clear(self):
+        self.coefficients = None
+
+    def _load_legacy(self):
+        """
+        Loads the latest loose coefficient artifact saved before the model manifest
+        existed, or the joblib models for versions older than that artifact.
         """
-        if self.model_home is None or self.model_away is None:
-            print("Error: Los modelos no están cargados. Ejecuta train_model() primero.")
-            return None, None, None, None
-        
-        if self.df_test is None:
-            print("Error: El dataset de prueba (df_test) no está cargado. Ejecuta load_test_data() primero.")
-            return None, None, None, None
+        print(f"Searching for latest {self.name} models in {self.models_dir}")
 
         try:
-            match_date = pd.to_datetime(date, format='%d/%m/%y')
-            
-            match_record = self.df_test[
-                (self.df_test['HomeTeam'] == home_team) &
-                (self.df_test['AwayTeam'] == away_team) &
-                (self.df_test['Date'] == match_date)
-            ]
-
-            if match_record.empty:
-                print(f"Error: No se encontró el partido {home_team} vs {away_team} en la fecha {date} en el dataset de prueba.")
-                return None, None, None, None
-
+            coefficient_files = [f for f in os.listdir(self.models_dir)
+                                 if f.startswith(self.artifact_prefix) and f.endswith('.npz')] \
+                if os.path.isdir(self.models_dir) else []
+            if coefficient_files:
+                latest_file = max(coefficient_files, key=lambda f: os.path.getmtime(os.path.join(self.models_dir, f)))
+                self.load(os.path.join(self.models_dir, latest_file))
+                return
+            self._load_joblib_models()
         except Exception as e:
-            print(f"Error al buscar el partido en el dataset de prueba: {e}")
-            return None, None, None, None
-
-        input_data = match_record[FEATURES_COLUMNS]
-
-        pred_h = self.model_home.predict(input_data)[0]
-        pred_a = self.model_away.predict(input_data)[0]
-
-        real_h = match_record[HOME_TARGET].iloc[0]
-        real_a = match_record[AWAY_TARGET].iloc[0]
+            print(f"An error occurred while loading models: {e}")
+            self.model_home = None
+            self.model_away = None
+            self.coefficients = None
+
+    def load(self, path: str):
+        """Loads a coefficient artifact (NumPy only, no sklearn import)."""
+        with np.load(path, allow_pickle=False) as artifact:
+            self.coefficients = artifact['coefficients']
+            self.feature_order = artifact['features'].tolist()
+            self.cv_report = json.loads(str(artifact['report'])) if 'report' in artifact.files else None
+            # Artefactos anteriores a update() no tienen estadísticos: solo admiten train()
+            self.statistics = NormalEquations.from_arrays(artifact) if 'xtx' in artifact.files else None
+            self.statistics_last_match = tuple(artifact['last_match'].tolist()) if 'last_match' in artifact.files else None
+        self.model_path = path
+        if self.df_test is not None:
+            self._build_fixture_index()
+        print(f"Coefficients loaded successfully from {path}")
 
-        print(f"Predicción para {home_team} vs {away_team}: {pred_h:.2f} - {pred_a:.2f}")
-        print(f"Resultado real: {real_h} - {real_a}")
+    def _load_joblib_models(self):
+        import joblib
 
-        return pred_h, pred_a, real_h, real_a
+        home_models = [f for f in os.listdir(self.models_dir) if f.startswith('home_model_') and f.endswith('.pkl')]
+        away_models = [f for f in os.listdir(self.models_dir) if f.startswith('away_model_') and f.endswith('.pkl')]
 
+        if not home_models or not away_models:
+            print("Error: No model files found in the directory.")
+            self.model_home = None
+            self.model_away = None
+            self.coefficients = None
+            return
+
+        latest_home_model_file = max(home_models, key=lambda f: os.path.getmtime(os.path.join(self.models_dir, f)))
+        latest_away_model_file = max(away_models, key=lambda f: os.path.getmtime(os.path.join(self.models_dir, f)))
+
+        home_model_path = os.path.join(self.models_dir, latest_home_model_file)
+        away_model_path = os.path.join(self.models_dir, latest_away_model_file)
+
+        print(f"Loading models from {home_model_path} and {away_model_path}")
+        self.model_home = joblib.load(home_model_path)
+        self.model_away = joblib.load(away_model_path)
+        self.feature_order = list(FEATURES_COLUMNS)
+        self.coefficients = self._export_coefficients()
+        print("Models loaded successfully.")
+
+    def _export_coefficients(self):
+        """Returns the fitted models as a (2, 1 + n_features) array: [intercept, coef...]."""
+        return np.vstack([
+            np.concatenate([[self.model_home.intercept_], self.model_home.coef_]),
+            np.concatenate([[self.model_away.intercept_], self.model_away.coef_])
+        ])
+
+    def _predict_rows(self, features):
+        # Modelo lineal: producto directo con los coeficientes, sin sklearn ni DataFrames
+        return features @ self.coefficients[:, 1:].T + self.coefficients[:, 0]
+
+
+class RidgeRegressionModel(MultipleLinearRegressionModel):
+    """
+    Regresión ridge: las mismas ecuaciones normales con una penalización L2 en la
+    diagonal (sin penalizar el intercepto), equivalente a sklearn Ridge(alpha).
+    """
+
+    name = 'ridge'
+    artifact_prefix = 'ridge_coefficients_'
+
+    def __init__(self, alpha: float = RIDGE_ALPHA, forgetting: float = MODEL_FORGETTING):
+        super().__init__(forgetting)
+        self.alpha = alpha
+
+    def _load_joblib_models(self):
+        # Los modelos joblib antiguos son siempre lineales
+        print(f"Error: No {self.name} model files found in the directory.")
+        self.coefficients = None
@@ -0,0 +1,78 @@
+import numpy as np
+
+# Filas que se pasan a float64 de una vez: la matriz compartida (float32) no se copia entera
+BLOCK_ROWS = 65536
+
+
+class NormalEquations:
+    """
+    Estadísticos suficientes de una regresión lineal con intercepto: XᵀX, Xᵀy y el
+    número de filas, para varios objetivos a la vez (goles local y visitante).
+
+    Añadir filas es sumar su contribución (una actualización de rango k), así que un
+    conjunto de entrenamiento que crece (validación walk-forward, partidos nuevos) no
+    obliga a reajustar desde cero; resolver es un sistema de (1 + n_features) ecuaciones.
+
+    Con `forgetting` < 1 cada fila pesa `forgetting` veces lo que la siguiente, como
+    mínimos cuadrados recursivos con olvido exponencial.
+    """
+
+    def __init__(self, n_features: int, n_targets: int, forgetting: float = 1.0):
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting must be in (0, 1].")
+        self.xtx = np.zeros((n_features + 1, n_features + 1))
+        self.xty = np.zeros((n_features + 1, n_targets))
+        self.n_rows = 0
+        self.forgetting = forgetting
+
+    def add(self, X: np.ndarray, Y: np.ndarray):
+        """Folds rows `X` (k, n_features) with targets `Y` (k, n_targets) into the statistics."""
+        for start in range(0, len(X), BLOCK_ROWS):
+            self._add_block(X[start:start + BLOCK_ROWS], Y[start:start + BLOCK_ROWS])
+
+    def _add_block(self, X, Y):
+        design = self.design(X)
+        if self.forgetting < 1:
+            # La fila más reciente pesa 1; las anteriores (y lo acumulado) decaen
+            weights = self.forgetting ** np.arange(len(design) - 1, -1, -1, dtype=np.float64)
+            self.xtx *= self.forgetting ** len(design)
+            self.xty *= self.forgetting ** len(design)
+            weighted = design * weights[:, None]
+        else:
+            weighted = design
+        self.xtx += weighted.T @ design
+        self.xty += weighted.T @ Y
+        self.n_rows += len(X)
+
+    def solve(self, alpha: float = 0.0) -> np.ndarray:
+        """
+        Args:
+            alpha: penalización ridge (L2) de los coeficientes; el intercepto no se penaliza.
+
+        Returns:
+            np.ndarray: (n_targets, 1 + n_features) con el intercepto en la columna 0,
+            el mismo formato que `MultipleLinearRegressionModel.coefficients`.
+        """
+        # lstsq también resuelve sistemas singulares (features constantes o colineales)
+        xtx = self.xtx
+        if alpha:
+            xtx = xtx + alpha * np.diag(np.r_[0.0, np.ones(len(xtx) - 1)])
+        return np.linalg.lstsq(xtx, self.xty, rcond=None)[0].T
+
+    def to_arrays(self) -> dict:
+        """Arrays to store with np.savez (see from_arrays)."""
+        return {'xtx': self.xtx, 'xty': self.xty,
+                'n_rows': np.array(self.n_rows), 'forgetting': np.array(self.forgetting)}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        equations = cls(arrays['xtx'].shape[0] - 1, arrays['xty'].shape[1], float(arrays['forgetting']))
+        equations.xtx = np.array(arrays['xtx'], dtype=np.float64)
+        equations.xty = np.array(arrays['xty'], dtype=np.float64)
+        equations.n_rows = int(arrays['n_rows'])
+        return equations
+
+    @staticmethod
+    def design(X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        return np.column_stack([np.ones(len(X)), X])
@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pandas as pd
+from ..config import MODELS, MODEL_WORKERS, MODEL_RETENTION, N_SPLITS
+from ..instrumentation import stage
+from ..store import ModelStore
+from .base_model import MODELS_DIR
+from .feature_matrix import FeatureMatrix
+from .multiple_linear_regression import MultipleLinearRegressionModel, RidgeRegressionModel
+from .sklearn_models import PoissonRegressionModel, GradientBoostingModel
+
+MODEL_TYPES = {cls.name: cls for cls in (MultipleLinearRegressionModel, RidgeRegressionModel,
+                                        PoissonRegressionModel, GradientBoostingModel)}
+
+
+def create_model(name: str):
+    if name not in MODEL_TYPES:
+        raise ValueError(f"Unknown model '{name}'. Available models: {', '.join(MODEL_TYPES)}")
+    return MODEL_TYPES[name]()
+
+
+class ModelRegistry:
+    """
+    Varios modelos de goles entrenados y cargados por nombre.
+
+    El entrenamiento construye una única FeatureMatrix (float32) y entrena los modelos
+    en paralelo con hilos, que comparten esa matriz sin copiarla: NumPy y sklearn
+    liberan el GIL en el cálculo pesado. El primer nombre es el modelo por defecto.
+
+    Cada save() es una versión del ModelStore con los artefactos de todos los modelos,
+    la partición de prueba, las features y las métricas; load() carga todos los
+    modelos de la misma versión.
+    """
+
+    def __init__(self, names=None, workers=MODEL_WORKERS):
+        self.names = list(names or MODELS)
+        for name in self.names:
+            if name not in MODEL_TYPES:
+                raise ValueError(f"Unknown model '{name}'. Available models: {', '.join(MODEL_TYPES)}")
+        self.workers = workers or min(len(self.names), os.cpu_count() or 1)
+        self.models = {}
+        self.store = ModelStore(MODELS_DIR, MODEL_RETENTION)
+        # Descripción de la versión guardada o cargada (ver ModelStore)
+        self.version = None
+
+    @property
+    def default(self):
+        return self.names[0]
+
+    def get(self, name=None):
+        """The model called `name` (the default one if None), or None if it is not available."""
+        return self.models.get(name or self.default)
+
+    def train(self, data: pd.DataFrame, update: bool = False):
+        """
+        Trains every model on one shared feature matrix.
+
+        Args:
+            data: processed matches.
+            update: models that support it (update()) are loaded and refitted with
+                only the new matches; they are trained from scratch if that fails.
+
+        Returns:
+            dict: test split metrics of each model, by name.
+        """
+        with stage('ModelRegistry.train', rows=len(data)):
+            matrix = FeatureMatrix(data)
+
+            def fit(name):
+                model = create_model(name)
+                with stage(f'{type(model).__name__}.train', rows=len(matrix)):
+                    if update and hasattr(model, 'update'):
+                        model.load_models()
+                        if model.update(matrix):
+                            return model
+                    model.fit(matrix)
+                return model
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                self.models = dict(zip(self.names, executor.map(fit, self.names)))
+
+        metrics = self.metrics()
+        for name, values in metrics.items():
+            if values:
+                print(f"{name:<8} test MAE home {values['home_mae']:.3f} away {values['away_mae']:.3f}, "
+                      f"RMSE home {values['home_rmse']:.3f} away {values['away_rmse']:.3f}")
+        return metrics
+
+    def metrics(self):
+        return {name: model.test_metrics() for name, model in self.models.items()}
+
+    def save(self):
+        """Saves every model, the test split and their metrics as a new version."""
+        os.makedirs(self.store.directory, exist_ok=True)
+        version, directory = self.store.create_version()
+        try:
+            with stage('ModelRegistry.save'):
+                models = {}
+                for name, model in self.models.items():
+                    with stage(f'{type(model).__name__}.save'):
+                        models[name] = {
+                            'file': model.save(directory),
+                            'metrics': model.test_metrics(),
+                            'cv': model.cv_report['mean'] if model.cv_report else None,
+                            # Filas de entrenamiento sobre las que se calculó 'cv'
+                            'cv_train_rows': model.cv_report.get('train_rows') if model.cv_report else None
+                        }
+                # La partición de prueba es la misma para todos: se escribe una vez
+                default = self.get()
+                default.save_test_data(os.path.join(directory, 'test.csv'))
+                self.version = self.store.commit(version, {
+                    'created_at': datetime.now().isoformat(timespec='seconds'),
+                    'default': self.default,
+                    'models': models,
+                    'test': 'test.csv',
+                    'test_rows': len(default.df_test),
+                    'features': default.feature_order,
+                    'n_splits': N_SPLITS
+                })
+        except BaseException:
+            self.store.discard(version)
+            raise
+        for model in self.models.values():
+            model.test_path = self.store.path(version, 'test.csv')
+        return self.version
+
+    def load(self):
+        """
+        Loads every model of the current version; the ones it does not have are
+        skipped. Without a version (files saved before the manifest) each model
+        falls back to its own loose files.
+        """
+        self.models = {}
+        self.version = self.store.current()
+        df_test = None
+        for name in self.names:
+            model = create_model(name)
+            with stage(f'{type(model).__name__}.load_models'):
+                if self.version is None:
+                    model.load_models()
+                elif name in self.version['models']:
+                    model.load_from_entry(self.version)
+                if not model.is_trained():
+                    continue
+                try:
+                    if df_test is None:
+                        model.load_test_data()
+                        df_test = model.df_test
+                    else:
+                        # La partición de prueba es la misma: se lee una vez
+                        model.df_test = df_test
+                        model._build_fixture_index()
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Could not load the test data for {name}: {e}")
+                    continue
+            self.models[name] = model
+        return self
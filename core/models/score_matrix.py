@@ -0,0 +1,72 @@
+import numpy as np
+from ..config import SCORE_MATRIX_MAX_GOALS, OVER_UNDER_LINES
+
+# Tasas nulas o negativas (posibles en el modelo lineal) se recortan a este mínimo
+MIN_RATE = 1e-3
+
+
+class ScoreMatrixEngine:
+    """
+    Convierte las tasas de goles predichas (local, visitante) en la matriz de
+    probabilidades de cada marcador, suponiendo goles de Poisson independientes, y
+    de ella obtiene 1X2, más/menos goles y ambos marcan.
+
+    Todo va por lotes: para n partidos la matriz es (n, k+1, k+1) y cada mercado es
+    una máscara fija sobre ella, así que todas las probabilidades salen de un solo
+    producto. Los log-factoriales y las máscaras se calculan una vez al crear el motor.
+    La probabilidad de más de k goles se acumula en la última fila/columna, de modo
+    que cada matriz suma 1.
+    """
+
+    def __init__(self, max_goals: int = SCORE_MATRIX_MAX_GOALS, lines=None):
+        if max_goals < 1:
+            raise ValueError("max_goals must be at least 1.")
+        self.max_goals = max_goals
+        self.lines = list(OVER_UNDER_LINES if lines is None else lines)
+        self.goals = np.arange(max_goals + 1)
+        # log(g!) para g = 0..k
+        self.log_factorials = np.concatenate([[0.0], np.cumsum(np.log(self.goals[1:]))])
+
+        home, away = np.meshgrid(self.goals, self.goals, indexing='ij')
+        markets = {
+            'home_win': home > away,
+            'draw': home == away,
+            'away_win': home < away,
+        }
+        for line in self.lines:
+            markets[f'over_{self._line_name(line)}'] = home + away > line
+            markets[f'under_{self._line_name(line)}'] = home + away < line
+        markets['btts'] = (home > 0) & (away > 0)
+        self.market_names = list(markets)
+        # (n_mercados, k+1, k+1)
+        self.masks = np.stack(list(markets.values())).astype(np.float64)
+
+    @staticmethod
+    def _line_name(line):
+        return f'{line:g}'.replace('.', '_')
+
+    def pmf(self, rates) -> np.ndarray:
+        """(n,) rates -> (n, k+1) Poisson probabilities of 0..k goals, the last one being 'k or more'."""
+        rates = np.maximum(np.asarray(rates, dtype=np.float64), MIN_RATE)
+        log_p = self.goals * np.log(rates)[:, None] - rates[:, None] - self.log_factorials
+        p = np.exp(log_p)
+        p[:, -1] += np.clip(1.0 - p.sum(axis=1), 0.0, None)
+        return p
+
+    def matrix(self, home_rates, away_rates) -> np.ndarray:
+        """(n, k+1, k+1): P(home goals = i, away goals = j) for every fixture."""
+        return self.pmf(home_rates)[:, :, None] * self.pmf(away_rates)[:, None, :]
+
+    def probabilities(self, home_rates, away_rates) -> dict:
+        """
+        Returns:
+            dict: market name -> (n,) probabilities (home_win, draw, away_win,
+            over_<line>/under_<line>, btts), plus the most likely score
+            (likely_home_goals, likely_away_goals).
+        """
+        matrix = self.matrix(home_rates, away_rates)
+        values = np.einsum('nij,mij->mn', matrix, self.masks)
+        result = dict(zip(self.market_names, values))
+        likely = matrix.reshape(len(matrix), (self.max_goals + 1) ** 2).argmax(axis=1)
+        result['likely_home_goals'], result['likely_away_goals'] = np.divmod(likely, self.max_goals + 1)
+        return result
@@ -0,0 +1,79 @@
+from abc import abstractmethod
+import os
+import numpy as np
+from ..config import POISSON_ALPHA, GBM_PARAMS
+from .base_model import BaseModel
+from .feature_matrix import FeatureMatrix
+
+
+class SklearnGoalModel(BaseModel):
+    """
+    Modelo de goles con un estimador de sklearn por objetivo (local y visitante).
+
+    Los estimadores se ajustan directamente sobre la vista float32 de la matriz
+    compartida y se guardan juntos, con el orden de las features, en un único
+    fichero joblib (<name>.joblib) dentro de la versión del ModelStore.
+    """
+
+    @abstractmethod
+    def _estimator(self):
+        """Returns a new, unfitted estimator for one target."""
+        pass
+
+    def fit(self, matrix: FeatureMatrix):
+        self.feature_order = list(matrix.features)
+        self.df_test = matrix.df_test
+        self._build_fixture_index()
+        self.model_home = self._estimator().fit(matrix.X_train, matrix.Y_train[:, 0])
+        self.model_away = self._estimator().fit(matrix.X_train, matrix.Y_train[:, 1])
+        return None
+
+    def is_trained(self):
+        return self.model_home is not None and self.model_away is not None
+
+    def save(self, directory: str) -> str:
+        import joblib
+
+        file_name = f'{self.name}.joblib'
+        joblib.dump({'home': self.model_home, 'away': self.model_away, 'features': self.feature_order},
+                    os.path.join(directory, file_name))
+        return file_name
+
+    def load(self, path: str):
+        import joblib
+
+        artifact = joblib.load(path)
+        self.model_home, self.model_away = artifact['home'], artifact['away']
+        self.feature_order = artifact['features']
+        self.model_path = path
+        if self.df_test is not None:
+            self._build_fixture_index()
+        print(f"{self.name} models loaded successfully from {path}")
+
+    def _predict_rows(self, features):
+        features = np.asarray(features, dtype=np.float32)
+        return np.column_stack([self.model_home.predict(features), self.model_away.predict(features)])
+
+
+class PoissonRegressionModel(SklearnGoalModel):
+    """GLM de Poisson (enlace log): los goles son conteos, la predicción es su media."""
+
+    name = 'poisson'
+
+    def _estimator(self):
+        from sklearn.linear_model import PoissonRegressor
+        return PoissonRegressor(alpha=POISSON_ALPHA, max_iter=1000)
+
+
+class GradientBoostingModel(SklearnGoalModel):
+    """
+    Gradient boosting por histogramas con pérdida de Poisson. Es el único modelo que
+    copia la matriz: sklearn la pasa a float64 para discretizarla (uint8) y usa todos
+    los núcleos con OpenMP.
+    """
+
+    name = 'gbm'
+
+    def _estimator(self):
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        return HistGradientBoostingRegressor(loss='poisson', **GBM_PARAMS)
@@ -1,36 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from glob import glob
 import os
 import pandas as pd
 
-from .config import ESSENTIAL_COLUMNS
+from .config import ESSENTIAL_COLUMNS, N
+from .instrumentation import stage
 
+DATE_FORMAT = '%d/%m/%y'
+CATEGORY_COLUMNS = ['HomeTeam', 'AwayTeam', 'FTR']
+TEAM_COLUMNS = ['HomeTeam', 'AwayTeam']
+COUNT_COLUMNS = [c for c in ESSENTIAL_COLUMNS if c not in ['Date'] + CATEGORY_COLUMNS]
 
 
 class PreProcessor:
-    def __init__(self, working_path):
+    def __init__(self, working_path, data_files=None, max_workers=None, cache=None):
         self.working_path = working_path
+        # Si se indican ficheros concretos, solo se leen esos en lugar de todo el directorio
+        self.data_files = data_files
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # NormalizedFrameCache opcional: los ficheros sin cambios no se vuelven a leer
+        self.cache = cache
         self.data = None
 
+    @staticmethod
+    def cache_config_key():
+        """Configuration values that change the normalized frames (part of the cache key)."""
+        return repr((N, ESSENTIAL_COLUMNS, DATE_FORMAT, CATEGORY_COLUMNS))
+
+    @staticmethod
+    def compact_types(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts the team and result columns to categoricals and the counts to the
+        smallest integer type. Home and away teams share one sorted dictionary, so
+        their codes are comparable team ids.
+        """
+        teams = pd.unique(pd.concat([df[column].astype(object) for column in TEAM_COLUMNS]).dropna())
+        team_dtype = pd.CategoricalDtype(sorted(teams))
+        for column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype(team_dtype if column in TEAM_COLUMNS else 'category')
+        for column in COUNT_COLUMNS:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        return df
+
+    def _load_file(self, file):
+        if self.cache is None:
+            return self._read_file(file)
+        key = self.cache.key_for(file)
+        df = self.cache.get(key)
+        if df is None:
+            df = self._read_file(file)
+            self.cache.put(key, df)
+        else:
+            print(f"Loaded {os.path.basename(file)} from cache")
+        return df
+
+    def _read_file(self, file):
+        # Solo se leen las columnas esenciales y la fecha se interpreta durante la lectura
+        df = pd.read_csv(
+            file,
+            usecols=ESSENTIAL_COLUMNS,
+            dtype={column: 'str' for column in CATEGORY_COLUMNS},
+            parse_dates=['Date'],
+            date_format=DATE_FORMAT
+        )
+        if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+            raise ValueError(f"Dates in {file} do not match the format {DATE_FORMAT}")
+        for column in COUNT_COLUMNS:
+            # Enteros pequeños (int8/int16); si hay valores vacíos la columna queda en float
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        return df
+
     def _normalize(self):
-        data_files = glob(os.path.join(self.working_path, "*.csv"))
+        data_files = self.data_files or glob(os.path.join(self.working_path, "*.csv"))
 
         if not data_files:
             raise FileNotFoundError(f"No data files found in {self.working_path}")
-        dataframes = []
-        for file in data_files: 
-            df = pd.read_csv(file)
-            dataframes.append(df)
 
-        full_dataframe = pd.concat(dataframes, ignore_index=True)
-        proccessed_dataframe = full_dataframe[ESSENTIAL_COLUMNS].copy()
+        workers = min(self.max_workers, len(data_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map conserva el orden de los ficheros
+            dataframes = list(executor.map(self._load_file, data_files))
+        if self.cache is not None:
+            self.cache.flush()
+
+        proccessed_dataframe = pd.concat(dataframes, ignore_index=True)
+        # Las categorías se crean sobre el conjunto completo para que compartan diccionario
+        proccessed_dataframe = self.compact_types(proccessed_dataframe)
 
-        proccessed_dataframe['Date'] = pd.to_datetime(proccessed_dataframe['Date'], format='%d/%m/%y')
+        proccessed_dataframe = proccessed_dataframe[ESSENTIAL_COLUMNS]
         proccessed_dataframe = proccessed_dataframe.sort_values(by='Date')
         proccessed_dataframe = proccessed_dataframe.reset_index(drop=True)
         self.data = proccessed_dataframe
 
     def get_data(self):
         if self.data is None:
-            self._normalize()
+            with stage('PreProcessor.normalize') as record:
+                self._normalize()
+                record.rows = len(self.data)
         return self.data
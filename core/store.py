@@ -0,0 +1,225 @@
+import json
+import os
+from datetime import datetime
+
+# numpy y pandas se importan dentro de los métodos: exists() se usa al arrancar
+# la aplicación y no debe pagar el coste de importarlos
+
+
+def write_json_atomic(path: str, payload):
+    """Writes a JSON file through a temporary file so readers never see it half written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+class ProcessedStore:
+    """
+    Almacén columnar (NumPy .npz) para los datos procesados.
+
+    Cada versión se guarda como un fichero `<version>.npz` con un array tipado por
+    columna, y `manifest.json` apunta a la versión actual. Cargar los datos es
+    leer el manifiesto y un único fichero, sin listar el directorio ni volver a
+    interpretar fechas. Las columnas categóricas (equipos, resultado) se guardan
+    como códigos enteros y su diccionario. Solo se conservan las últimas
+    `retention` versiones.
+
+    Cada versión puede llevar el estado por equipo del modo incremental
+    (`<version>.state.json`); se escribe antes de que el manifiesto apunte a la
+    versión, así que los datos y su estado cambian juntos o no cambian.
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+    STATE_SUFFIX = '.state.json'
+    COLUMNS_KEY = '__columns__'
+    CATEGORIES_SUFFIX = '__categories'
+
+    def __init__(self, directory: str, retention: int):
+        self.directory = directory
+        self.retention = retention
+        self.manifest_path = os.path.join(directory, self.MANIFEST_NAME)
+
+    def exists(self) -> bool:
+        return self._read_manifest().get('current') is not None
+
+    def save(self, df, state=None) -> str:
+        """
+        Saves a new version, makes it the current one and prunes old versions.
+        `state` (JSON-serializable, optional) is stored with the version.
+        """
+        import numpy as np
+        import pandas as pd
+
+        os.makedirs(self.directory, exist_ok=True)
+        version = datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')
+        arrays = {self.COLUMNS_KEY: np.array(df.columns, dtype=str)}
+        for i, column in enumerate(df.columns):
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                # Categóricas como códigos enteros más su diccionario
+                arrays[f'c{i}'] = df[column].cat.codes.to_numpy()
+                arrays[f'c{i}{self.CATEGORIES_SUFFIX}'] = df[column].cat.categories.to_numpy(dtype=str)
+            else:
+                arrays[f'c{i}'] = self._to_array(df[column])
+
+        tmp_path = self._version_path(version) + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            if state is not None:
+                write_json_atomic(self._state_path(version), state)
+            os.replace(tmp_path, self._version_path(version))
+        except BaseException:
+            # Sin manifiesto nuevo la versión no existe: no se dejan ficheros sueltos
+            for path in (tmp_path, self._state_path(version)):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+
+        manifest = self._read_manifest()
+        versions = manifest.get('versions', []) + [version]
+        kept, pruned = versions[-self.retention:], versions[:-self.retention]
+        write_json_atomic(self.manifest_path, {'current': version, 'versions': kept, 'rows': len(df)})
+
+        for old_version in pruned:
+            try:
+                os.remove(self._version_path(old_version))
+                if os.path.exists(self._state_path(old_version)):
+                    os.remove(self._state_path(old_version))
+            except OSError as e:
+                print(f"Could not remove old processed version {old_version}: {e}")
+        print(f"Processed data saved as version {version}")
+        return version
+
+    def load(self):
+        """Loads the current version, or returns None if there is none."""
+        version = self._read_manifest().get('current')
+        if version is None:
+            return None
+        import numpy as np
+        import pandas as pd
+
+        with np.load(self._version_path(version), allow_pickle=False) as arrays:
+            columns = arrays[self.COLUMNS_KEY].tolist()
+            data = {}
+            for i, column in enumerate(columns):
+                categories = f'c{i}{self.CATEGORIES_SUFFIX}'
+                if categories in arrays.files:
+                    data[column] = pd.Categorical.from_codes(arrays[f'c{i}'], arrays[categories])
+                else:
+                    data[column] = arrays[f'c{i}']
+            return pd.DataFrame(data)
+
+    def load_state(self):
+        """State stored with the current version, or None if it has none."""
+        version = self._read_manifest().get('current')
+        if version is None or not os.path.exists(self._state_path(version)):
+            return None
+        with open(self._state_path(version), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _to_array(self, series):
+        import pandas as pd
+
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.to_numpy(dtype='datetime64[ns]')
+        if pd.api.types.is_numeric_dtype(series):
+            return series.to_numpy()
+        return series.to_numpy(dtype=str)
+
+    def _version_path(self, version: str) -> str:
+        return os.path.join(self.directory, f'{version}.npz')
+
+    def _state_path(self, version: str) -> str:
+        return os.path.join(self.directory, f'{version}{self.STATE_SUFFIX}')
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+class ModelStore:
+    """
+    Versiones de los modelos entrenados en data/models.
+
+    Cada versión es un directorio `<version>/` con los artefactos de todos los
+    modelos, la partición de prueba y su descripción (`version.json`). Se escribe
+    primero en `<version>.tmp/` y se renombra al terminar; después `manifest.json`
+    (escrito de forma atómica) pasa a apuntar a ella. Quien lee solo sigue el
+    manifiesto, así que nunca ve una versión a medias ni mezcla ficheros de dos
+    entrenamientos, y cargar no necesita listar el directorio. Solo se conservan
+    las últimas `retention` versiones.
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+    ENTRY_NAME = 'version.json'
+    STAGING_SUFFIX = '.tmp'
+
+    def __init__(self, directory: str, retention: int):
+        self.directory = directory
+        self.retention = retention
+        self.manifest_path = os.path.join(directory, self.MANIFEST_NAME)
+
+    def current(self):
+        """Description of the current version (with its 'version' key), or None."""
+        manifest = self._read_manifest()
+        return manifest.get('entry') if manifest.get('current') else None
+
+    def path(self, version: str, file_name: str) -> str:
+        return os.path.join(self.directory, version, file_name)
+
+    def current_path(self, key: str):
+        """Path of the file stored under `key` in the current version (e.g. 'test'), or None."""
+        entry = self.current()
+        if entry is None or not entry.get(key):
+            return None
+        return self.path(entry['version'], entry[key])
+
+    def create_version(self):
+        """
+        Returns:
+            tuple: (version, staging directory) where the new version's files are written.
+        """
+        version = datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')
+        staging = os.path.join(self.directory, version + self.STAGING_SUFFIX)
+        os.makedirs(staging)
+        return version, staging
+
+    def commit(self, version: str, entry: dict) -> dict:
+        """Publishes a staged version as the current one and prunes old versions."""
+        import shutil
+
+        entry = dict(entry, version=version)
+        staging = os.path.join(self.directory, version + self.STAGING_SUFFIX)
+        write_json_atomic(os.path.join(staging, self.ENTRY_NAME), entry)
+        os.replace(staging, os.path.join(self.directory, version))
+
+        manifest = self._read_manifest()
+        versions = manifest.get('versions', []) + [version]
+        kept, pruned = versions[-self.retention:], versions[:-self.retention]
+        write_json_atomic(self.manifest_path, {'current': version, 'versions': kept, 'entry': entry})
+
+        # Versiones antiguas y restos de guardados interrumpidos (solo hay un escritor a la vez)
+        stale = [os.path.join(self.directory, v) for v in pruned]
+        stale += [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                  if name.endswith(self.STAGING_SUFFIX)]
+        for path in stale:
+            try:
+                shutil.rmtree(path)
+            except OSError as e:
+                print(f"Could not remove old model version {path}: {e}")
+        print(f"Models saved as version {version}")
+        return entry
+
+    def discard(self, version: str):
+        import shutil
+
+        shutil.rmtree(os.path.join(self.directory, version + self.STAGING_SUFFIX), ignore_errors=True)
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
@@ -8,16 +8,15 @@ else:
     os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu --disable-software-rasterizer --disable-dev-shm-usage"
 
 import webview
-import pandas as pd
 import gc  # Garbage collection
+# Api no importa pandas ni sklearn: los datos y el modelo se cargan en segundo plano
 from app.api import Api
-from core.data_manager import DataManager
 import core.data_holder
 
 
 def cleanup():
     print("Cleaning up resources...")
-    core.data_holder.PROCESSED_DATA_JSON = '{"error": "No processed data found."}'
+    core.data_holder.set_processed_data(None)
     core.data_holder.TEST_DATA_JSON = '{"error": "No test data found."}'
     gc.collect()
 
@@ -26,8 +25,8 @@ if __name__ == '__main__':
     api = Api()
     gui_dir = os.path.join('app', 'gui', 'templates')
 
-    data_manager = DataManager()
-    if data_manager.check_file_exists():
+    has_processed_data = api.check_processed_data()
+    if has_processed_data:
         initial_html_file = os.path.join(gui_dir, 'layout.html')
         window_title = 'Goal Predictor'
     else:
@@ -46,4 +45,8 @@ if __name__ == '__main__':
 
     api.set_window(window)
 
+    # La ventana se muestra de inmediato; datos y modelo se cargan en paralelo
+    if has_processed_data:
+        api.start_background_loading()
+
     webview.start(debug=False)
\ No newline at end of file
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# Los tests importan `core` y `benchmarks` desde la raíz del proyecto, como los benchmarks
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture(autouse=True)
+def stage_log(tmp_path, monkeypatch):
+    """Las etapas medidas durante los tests se registran en un directorio temporal, no en data/logs."""
+    from core.instrumentation import recorder
+
+    monkeypatch.setattr(recorder, 'log_path', str(tmp_path / 'logs' / 'stages.jsonl'))
+    return recorder.log_path
@@ -0,0 +1,31 @@
+"""Caché de dataframes normalizados: las entradas ilegibles son un fallo de caché."""
+import os
+
+import pandas as pd
+import pytest
+
+from core.cache import NormalizedFrameCache
+
+
+@pytest.mark.parametrize('content', [
+    b'\x80\x04garbage',                 # pickle truncado
+    b'cnonexistent_module\nThing\n.',   # módulo que ya no existe
+    b'cpandas\nNoSuchAttribute\n.',     # clase de otra versión de pandas
+])
+def test_unreadable_entry_is_a_miss_and_removed(tmp_path, content):
+    cache = NormalizedFrameCache(str(tmp_path), max_bytes=10 ** 9)
+    cache.put('key', pd.DataFrame({'x': [1, 2]}))
+    with open(cache._entry_path('key'), 'wb') as f:
+        f.write(content)
+
+    assert cache.get('key') is None
+    assert not os.path.exists(cache._entry_path('key'))
+    cache.flush()
+    assert 'key' not in NormalizedFrameCache(str(tmp_path), max_bytes=10 ** 9)._index
+
+
+def test_readable_entry_round_trips(tmp_path):
+    cache = NormalizedFrameCache(str(tmp_path), max_bytes=10 ** 9)
+    df = pd.DataFrame({'x': [1, 2]})
+    cache.put('key', df)
+    pd.testing.assert_frame_equal(cache.get('key'), df)
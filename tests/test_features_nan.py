@@ -0,0 +1,77 @@
+"""Medias con estadísticas vacías: deben coincidir con `.mean()` / `.sum()` de pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_league_history
+from core.config import N, AVG_SHOTS_COLUMNS, AVG_CORNERS_COLUMNS, EFFICIENCY_COLUMNS
+from core.features import AvgShotsCalculator, AvgCornersCalculator, EfficiencyCalculator
+from core.features.utils import get_historical
+
+
+def league_with_missing_stats(seed, fraction=0.15):
+    df = generate_league_history(teams=6, seasons=1, seed=seed)[(0, 0)]
+    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%y')
+    rng = np.random.default_rng(seed)
+    for column in ['HS', 'AS', 'HC', 'AC']:
+        df[column] = df[column].astype(float)
+        df.loc[rng.random(len(df)) < fraction, column] = np.nan
+    return df.reset_index(drop=True)
+
+
+def team_values(history, team, home_column, away_column):
+    return history.apply(lambda x: x[home_column] if x['HomeTeam'] == team else x[away_column], axis=1)
+
+
+def baseline_averages(df, home_stat, away_stat):
+    """Semántica original: media de pandas (ignora vacíos) de los últimos N partidos de cada equipo."""
+    rows = []
+    for _, row in df.iterrows():
+        local, away = get_historical(row, df, N)
+        if local.empty or away.empty:
+            rows.append([np.nan] * 4)
+            continue
+        rows.append([
+            team_values(local, row['HomeTeam'], home_stat, away_stat).mean(),
+            team_values(local, row['HomeTeam'], away_stat, home_stat).mean(),
+            team_values(away, row['AwayTeam'], home_stat, away_stat).mean(),
+            team_values(away, row['AwayTeam'], away_stat, home_stat).mean(),
+        ])
+    return np.array(rows, dtype=float)
+
+
+def baseline_efficiency(df):
+    rows = []
+    for _, row in df.iterrows():
+        values = []
+        for history, team in zip(get_historical(row, df, N), (row['HomeTeam'], row['AwayTeam'])):
+            goals = team_values(history, team, 'FTHG', 'FTAG').sum() if not history.empty else 0
+            shots = team_values(history, team, 'HS', 'AS').sum() if not history.empty else 0
+            values.append(goals / shots if shots > 0 else 0.0)
+        rows.append(values)
+    return np.array(rows, dtype=float)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('calculator, columns, stats', [
+    (AvgShotsCalculator, AVG_SHOTS_COLUMNS, ('HS', 'AS')),
+    (AvgCornersCalculator, AVG_CORNERS_COLUMNS, ('HC', 'AC')),
+])
+def test_averages_skip_missing_values(seed, calculator, columns, stats):
+    df = league_with_missing_stats(seed)
+    result = calculator().compute(df, N)[columns].to_numpy(dtype=float)
+    np.testing.assert_allclose(result, baseline_averages(df, *stats), rtol=0, atol=1e-12)
+
+
+def test_single_missing_shot_value():
+    df = league_with_missing_stats(3, fraction=0)
+    df.loc[10, 'HS'] = np.nan
+    result = AvgShotsCalculator().compute(df, N)[AVG_SHOTS_COLUMNS].to_numpy(dtype=float)
+    np.testing.assert_allclose(result, baseline_averages(df, 'HS', 'AS'), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_efficiency_sums_skip_missing_values(seed):
+    df = league_with_missing_stats(seed)
+    result = EfficiencyCalculator().compute(df, N)[EFFICIENCY_COLUMNS].to_numpy(dtype=float)
+    np.testing.assert_allclose(result, baseline_efficiency(df), rtol=0, atol=1e-12)
@@ -0,0 +1,87 @@
+"""El modo incremental debe dar los mismos datos que reconstruir todo el historial."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_league_history
+from core.data_manager import DataManager, DataType
+from core.store import ProcessedStore
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    # DataManager crea data/processed y data/raw relativos al directorio actual
+    monkeypatch.chdir(tmp_path)
+    history = generate_league_history(teams=6, seasons=3, seed=5)
+    # Una estadística vacía en los partidos nuevos
+    history[(0, 2)]['HS'] = history[(0, 2)]['HS'].astype(float)
+    history[(0, 2)].loc[3, 'HS'] = np.nan
+    for name, seasons in [('initial', [0, 1]), ('all', [0, 1, 2])]:
+        (tmp_path / name).mkdir()
+        for season in seasons:
+            history[(0, season)].to_csv(tmp_path / name / f'season-{season:03d}.csv', index=False)
+    return tmp_path
+
+
+def manager(root, source, store):
+    data_manager = DataManager(DataType.DEFAULT)
+    data_manager.working_path = str(root / source)
+    data_manager.cache_path = str(root / 'cache')
+    data_manager.store = ProcessedStore(str(root / store), 3)
+    data_manager.state_path = str(root / store / 'team_state.json')
+    return data_manager
+
+
+def rebuild(root, source, store):
+    data_manager = manager(root, source, store)
+    data_manager.process_data(workers=1)
+    data_manager.save_data()
+    return data_manager
+
+
+def normalized(df):
+    df = df.copy()
+    for column in ['HomeTeam', 'AwayTeam', 'FTR']:
+        df[column] = df[column].astype(str)
+    return df.sort_values(['Date', 'HomeTeam', 'AwayTeam']).reset_index(drop=True)
+
+
+def test_incremental_matches_full_rebuild(root):
+    rebuild(root, 'initial', 'incremental')
+    new_file = str(root / 'all' / 'season-002.csv')
+    assert manager(root, 'all', 'incremental').process_incremental([new_file])
+
+    incremental = manager(root, 'all', 'incremental')
+    incremental.load_data()
+    full = rebuild(root, 'all', 'full')
+    full.load_data()
+
+    assert incremental.data['HS'].isna().sum() == 1
+    pd.testing.assert_frame_equal(normalized(incremental.data), normalized(full.data), check_dtype=False)
+
+
+def test_repeated_upload_is_not_appended_twice(root):
+    rebuild(root, 'initial', 'incremental')
+    new_file = str(root / 'all' / 'season-002.csv')
+    assert manager(root, 'all', 'incremental').process_incremental([new_file])
+    rows = manager(root, 'all', 'incremental').store.load().shape[0]
+
+    # Los partidos ya no son posteriores a la marca de agua guardada con los datos
+    assert not manager(root, 'all', 'incremental').process_incremental([new_file])
+    assert manager(root, 'all', 'incremental').store.load().shape[0] == rows
+
+
+def test_failed_state_update_leaves_data_unchanged(root, monkeypatch):
+    rebuild(root, 'initial', 'incremental')
+    store = manager(root, 'all', 'incremental').store
+    rows = store.load().shape[0]
+
+    from core.features import TeamState
+
+    def broken(self, matches):
+        raise ValueError('state update failed')
+
+    monkeypatch.setattr(TeamState, 'update', broken)
+    with pytest.raises(ValueError):
+        manager(root, 'all', 'incremental').process_incremental([str(root / 'all' / 'season-002.csv')])
+    assert store.load().shape[0] == rows
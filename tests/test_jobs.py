@@ -0,0 +1,44 @@
+"""Cola de trabajos: los duplicados se rechazan y ningún envío distinto se pierde."""
+import threading
+
+from app.jobs import JobManager
+
+
+def test_different_submissions_all_run():
+    manager = JobManager()
+    release = threading.Event()
+    done = threading.Event()
+    received = []
+
+    def blocking(job):
+        release.wait(5)
+
+    def record(job, files):
+        received.append(files)
+        if len(received) == 2:
+            done.set()
+
+    manager.submit('process_files', blocking, fingerprint='running')
+    first, accepted_first = manager.submit('process_files', record, (['a.csv'],), 'a')
+    second, accepted_second = manager.submit('process_files', record, (['b.csv'],), 'b')
+    release.set()
+
+    assert done.wait(5)
+    assert accepted_first and accepted_second
+    assert first.id != second.id
+    assert received == [['a.csv'], ['b.csv']]
+
+
+def test_identical_submission_is_rejected():
+    manager = JobManager()
+    release = threading.Event()
+
+    def blocking(job):
+        release.wait(5)
+
+    job, _ = manager.submit('process_files', blocking, fingerprint='same')
+    duplicate, accepted = manager.submit('process_files', blocking, fingerprint='same')
+    release.set()
+
+    assert not accepted
+    assert duplicate is job
@@ -0,0 +1,34 @@
+"""Regresión lineal: el informe walk-forward describe siempre las filas del modelo guardado."""
+import numpy as np
+import pandas as pd
+
+from core.config import FEATURES_COLUMNS, HOME_TARGET, AWAY_TARGET
+from core.models.feature_matrix import FeatureMatrix
+from core.models.multiple_linear_regression import MultipleLinearRegressionModel
+
+
+def processed_history(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((rows, len(FEATURES_COLUMNS))), columns=FEATURES_COLUMNS)
+    df[HOME_TARGET] = rng.poisson(1.5, rows)
+    df[AWAY_TARGET] = rng.poisson(1.1, rows)
+    df['Date'] = pd.date_range('2020-08-01', periods=rows, freq='D')
+    df['HomeTeam'] = [f'H{i % 10}' for i in range(rows)]
+    df['AwayTeam'] = [f'A{i % 10}' for i in range(rows)]
+    return df
+
+
+def test_report_records_its_training_rows():
+    matrix = FeatureMatrix(processed_history(220))
+    report = MultipleLinearRegressionModel().fit(matrix)
+    assert report['train_rows'] == matrix.train_rows
+
+
+def test_update_clears_the_previous_report():
+    history = processed_history(330)
+    model = MultipleLinearRegressionModel()
+    model.fit(FeatureMatrix(history.iloc[:220]))
+    assert model.cv_report is not None
+
+    assert model.update(FeatureMatrix(history))
+    assert model.cv_report is None
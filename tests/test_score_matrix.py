@@ -0,0 +1,53 @@
+"""Predicciones por lotes con probabilidades cuando ningún partido está en el conjunto de prueba."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import FEATURES_COLUMNS, HOME_TARGET, AWAY_TARGET
+from core.models.multiple_linear_regression import MultipleLinearRegressionModel
+from core.models.score_matrix import ScoreMatrixEngine
+from core.models.sklearn_models import PoissonRegressionModel
+
+
+def processed_history(rows=220, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((rows, len(FEATURES_COLUMNS))), columns=FEATURES_COLUMNS)
+    df[HOME_TARGET] = rng.poisson(1.5, rows)
+    df[AWAY_TARGET] = rng.poisson(1.1, rows)
+    df['Date'] = pd.date_range('2020-08-01', periods=rows, freq='D')
+    df['HomeTeam'] = [f'H{i % 10}' for i in range(rows)]
+    df['AwayTeam'] = [f'A{i % 10}' for i in range(rows)]
+    return df
+
+
+def test_probabilities_of_empty_batch():
+    result = ScoreMatrixEngine().probabilities(np.array([]), np.array([]))
+    assert all(len(values) == 0 for values in result.values())
+    assert {'home_win', 'draw', 'away_win', 'likely_home_goals', 'likely_away_goals'} <= set(result)
+
+
+@pytest.mark.parametrize('model_class', [MultipleLinearRegressionModel, PoissonRegressionModel])
+def test_predict_batch_unknown_fixture(model_class):
+    model = model_class()
+    model.train(processed_history())
+
+    result = model.predict_batch([('X', 'Y', '01/01/25')], outcomes=True)
+
+    assert result['found'] == [False]
+    assert result['predicted_home_goals'] == [None]
+    assert result['p_home_win'] == [None]
+    assert result['likely_home_goals'] == [None]
+
+
+def test_predict_batch_mixes_known_and_unknown():
+    model = MultipleLinearRegressionModel()
+    model.train(processed_history())
+    row = model.df_test.iloc[0]
+    known = (row['HomeTeam'], row['AwayTeam'], row['Date'].strftime('%d/%m/%y'))
+
+    result = model.predict_batch([('X', 'Y', '01/01/25'), known], outcomes=True)
+
+    assert result['found'] == [False, True]
+    assert result['p_home_win'][0] is None
+    total = result['p_home_win'][1] + result['p_draw'][1] + result['p_away_win'][1]
+    assert total == pytest.approx(1.0, abs=1e-3)
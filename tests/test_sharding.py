@@ -0,0 +1,60 @@
+"""El cálculo por bloques en varios procesos debe dar el mismo dataframe que el serie."""
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_league_history
+from core.data_manager import DataManager, DataType
+from core.features.sharding import shard_bounds
+
+
+@pytest.fixture
+def league_dir(tmp_path, monkeypatch):
+    # DataManager crea data/processed y data/raw relativos al directorio actual
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / 'league'
+    directory.mkdir()
+    # Dos ligas en las mismas fechas: cada jornada tiene varios partidos el mismo día
+    history = generate_league_history(teams=8, seasons=3, leagues=2, seed=3)
+    for (league, season), df in history.items():
+        if season == 1:
+            # Un equipo nuevo a mitad de temporada: aparece por primera vez dentro de un bloque
+            later = df.index >= len(df) // 2
+            df.loc[later] = df.loc[later].replace(f'L{league} Team 07', f'L{league} Newcomer')
+        if season == 2:
+            df = df.replace(f'L{league} Team 06', f'L{league} Promoted')
+        df.to_csv(directory / f'league-{league}-season-{season:03d}.csv', index=False)
+    return directory
+
+
+def processed(directory, workers):
+    manager = DataManager(DataType.DEFAULT)
+    manager.working_path = str(directory)
+    manager.cache_path = os.path.join(str(directory.parent), f'cache-{workers}')
+    manager.process_data(workers=workers)
+    assert manager.data is not None
+    return manager
+
+
+@pytest.mark.parametrize('workers', [2, 3, 5])
+def test_sharded_matches_serial(league_dir, workers):
+    serial = processed(league_dir, 1)
+    sharded = processed(league_dir, workers)
+
+    pd.testing.assert_frame_equal(sharded.data, serial.data)
+    assert sharded.form_state == serial.form_state
+
+
+def test_new_teams_start_inside_a_shard(league_dir):
+    data = processed(league_dir, 1).data
+    bounds = shard_bounds(data['Date'], 3)
+    starts = {start for start, _ in bounds}
+    assert len(bounds) == 3
+
+    for team in ['L0 Newcomer', 'L1 Promoted']:
+        first = int(((data['HomeTeam'] == team) | (data['AwayTeam'] == team)).to_numpy().argmax())
+        assert first not in starts
+    # Ningún límite separa partidos del mismo día
+    for start, _ in bounds[1:]:
+        assert data['Date'].iloc[start] != data['Date'].iloc[start - 1]